@@ -0,0 +1,79 @@
+"""
+Fan-out dispatch latency of EventSubscriber against many local connections.
+
+Every connection holds its own channel, so a message reaches one websocket.
+"scan" is the previous dispatch, a pass over every connection's channel set;
+"index" is the channel -> connections lookup that ``_fanout`` uses now. No
+Redis is needed; messages are dispatched straight into the send queues.
+
+    python -m benchmarks.fanout
+    python -m benchmarks.fanout --connections 10000 100000 --messages 2000
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from common.redis.pubsub import EventSubscriber
+
+
+class _NullConnection:
+    async def send_text(self, data: str) -> None:
+        pass
+
+    async def receive_text(self) -> str:
+        return ""
+
+    async def close(self, *, code: int, reason: str | None = None) -> None:
+        pass
+
+    async def accept(self) -> None:
+        pass
+
+
+def _scan_fanout(subscriber: EventSubscriber, channel: str, raw: str) -> None:
+    conns = {
+        conn
+        for conn, channels in subscriber._session_channels.items()
+        if channel in channels
+    }
+    subscriber._deliver(conns, raw)
+
+
+async def _run(connections: int, messages: int) -> None:
+    subscriber = EventSubscriber(None, logger=logging.getLogger(__name__))
+    for i in range(connections):
+        await subscriber.subscribe_user(f"s{i}", _NullConnection(), channels=[f"ch{i}"])
+
+    channels = [f"ch{i * 7919 % connections}" for i in range(messages)]
+    raw = '{"destination":"ws_event","event":"e","data":{}}'
+
+    started = time.perf_counter()
+    for channel in channels:
+        _scan_fanout(subscriber, channel, raw)
+    scan = (time.perf_counter() - started) / messages
+
+    started = time.perf_counter()
+    for channel in channels:
+        await subscriber._fanout(channel, raw)
+    index = (time.perf_counter() - started) / messages
+
+    print(
+        f"{connections:>8} connections: scan {scan * 1e6:10.1f} us/msg, "
+        f"index {index * 1e6:6.2f} us/msg ({scan / index:,.0f}x)"
+    )
+    await subscriber.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--messages", type=int, default=1000)
+    args = parser.parse_args()
+
+    for connections in args.connections:
+        asyncio.run(_run(connections, args.messages))
+
+
+if __name__ == "__main__":
+    main()
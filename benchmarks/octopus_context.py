@@ -0,0 +1,81 @@
+"""
+OctopusContext write throughput for one aggregation tick.
+
+A tick updates ``--fields`` fields of each of ``--companies`` companies:
+
+- per-field: the previous ``set_field`` path, HSET then EXPIRE per field
+- set_fields: one transaction per company
+- set_many: one transaction for the whole tick
+
+Writes go to ``octopus:context:{company_id}`` hashes of the given database.
+
+    python -m benchmarks.octopus_context --redis-url redis://localhost:6379 --db 1
+"""
+import argparse
+import json
+import time
+
+import redis
+
+from common.octopus.context import OctopusContext
+
+
+def _per_field(client: redis.Redis, updates: dict, ttl: int) -> None:
+    for company_id, mapping in updates.items():
+        key = f"octopus:context:{company_id}"
+        for field, value in mapping.items():
+            client.hset(key, field, json.dumps(value, ensure_ascii=False, default=str))
+            client.expire(key, ttl)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis-url", default="redis://localhost:6379")
+    parser.add_argument("--db", type=int, default=1)
+    parser.add_argument("--companies", type=int, default=50)
+    parser.add_argument("--fields", type=int, default=5)
+    parser.add_argument("--ticks", type=int, default=20)
+    args = parser.parse_args()
+
+    client = redis.Redis.from_url(args.redis_url, db=args.db, decode_responses=True)
+    context = OctopusContext(client=client)
+    fields = OctopusContext.FIELDS[: args.fields]
+    updates = {
+        company_id: {
+            field: {"company": company_id, "items": list(range(10))} for field in fields
+        }
+        for company_id in range(args.companies)
+    }
+    writes = args.ticks * args.companies * len(fields)
+
+    def per_field() -> None:
+        _per_field(client, updates, 3600)
+
+    def set_fields() -> None:
+        for company_id, mapping in updates.items():
+            context.set_fields(company_id, mapping)
+
+    def set_many() -> None:
+        context.set_many(updates)
+
+    try:
+        for name, tick in (
+            ("per-field", per_field),
+            ("set_fields", set_fields),
+            ("set_many", set_many),
+        ):
+            started = time.perf_counter()
+            for _ in range(args.ticks):
+                tick()
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:>10}: {elapsed / args.ticks * 1e3:8.2f} ms/tick, "
+                f"{writes / elapsed:10,.0f} fields/s"
+            )
+    finally:
+        client.delete(*(f"octopus:context:{c}" for c in updates))
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+OctopusEvent encode/decode cost per event.
+
+"legacy" is the previous event class (``asdict`` + ``json.dumps`` and an ISO
+timestamp per event); the others are the current serializers, skipped when
+their backend is not installed. ``encode`` includes building the event, since
+the timestamp used to dominate it.
+
+    python -m benchmarks.octopus_event
+    python -m benchmarks.octopus_event --number 200000 --epoch-millis
+"""
+import argparse
+import json
+import timeit
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+
+from common.octopus import (
+    JsonOctopusSerializer,
+    MsgpackOctopusSerializer,
+    OctopusEvent,
+    OrjsonOctopusSerializer,
+)
+
+
+@dataclass
+class _LegacyEvent:
+    type: str
+    company_id: int
+    bot_id: int | None = None
+    timestamp: str = ""
+    data: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.timestamp:
+            self.timestamp = datetime.now(timezone.utc).isoformat()
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, default=str)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "_LegacyEvent":
+        return cls(**json.loads(raw))
+
+
+_DATA = {
+    "chat_id": 123456,
+    "operator_id": 42,
+    "status": "completed",
+    "tags": ["vip", "callback", "uz"],
+    "messages": [{"role": "user", "text": "Salom, buyurtma qayerda?"}] * 5,
+}
+
+
+def _time(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def _report(name: str, encode: float, decode: float, size: int) -> None:
+    print(f"{name:>8}: encode {encode:6.2f} us, decode {decode:6.2f} us, {size} bytes")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument(
+        "--epoch-millis", action="store_true", help="stamp events with epoch millis"
+    )
+    args = parser.parse_args()
+    OctopusEvent.EPOCH_MILLIS = args.epoch_millis
+
+    legacy_raw = _LegacyEvent("chat.completed", 1, 2, data=_DATA).to_json()
+    encode = _time(
+        lambda: _LegacyEvent("chat.completed", 1, 2, data=_DATA).to_json(), args.number
+    )
+    decode = _time(lambda: _LegacyEvent.from_json(legacy_raw), args.number)
+    _report("legacy", encode, decode, len(legacy_raw.encode()))
+
+    for name, serializer_cls in (
+        ("json", JsonOctopusSerializer),
+        ("orjson", OrjsonOctopusSerializer),
+        ("msgpack", MsgpackOctopusSerializer),
+    ):
+        try:
+            serializer = serializer_cls()
+        except RuntimeError as e:
+            print(f"{name:>8}: skipped ({e})")
+            continue
+
+        raw = serializer.dumps(OctopusEvent("chat.completed", 1, 2, data=_DATA))
+        encode = _time(
+            lambda: serializer.dumps(OctopusEvent("chat.completed", 1, 2, data=_DATA)),
+            args.number,
+        )
+        decode = _time(lambda: serializer.loads(raw), args.number)
+        size = len(raw.encode() if isinstance(raw, str) else raw)
+        _report(name, encode, decode, size)
+
+
+if __name__ == "__main__":
+    main()
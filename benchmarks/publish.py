@@ -0,0 +1,94 @@
+"""
+EventPublisher throughput: one PUBLISH per event vs pipelined batches.
+
+Each round publishes ``--batch`` events to distinct operator channels:
+
+- per-call: ``publish_payload`` awaited one by one
+- concurrent: ``publish_payload`` for the whole batch under ``gather``
+- publish_many: the batch in one pipelined round trip
+- micro-batched: concurrent ``publish_payload`` with ``batch_window`` set
+
+Needs a Redis server; nothing subscribes, so messages go nowhere.
+
+    python -m benchmarks.publish --redis-url redis://localhost:6379/0
+"""
+import argparse
+import asyncio
+import time
+
+from redis.asyncio import Redis
+
+from common.redis.pubsub import BaseEventType, EventPayload, EventPublisher
+
+
+class _BenchEventType(BaseEventType):
+    status = "appeal_status"
+
+
+class _BenchPayload(EventPayload):
+    event: _BenchEventType
+
+
+async def _measure(name: str, rounds: int, batch: int, publish_round) -> None:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await publish_round()
+    elapsed = time.perf_counter() - started
+    print(f"{name:>14}: {rounds * batch / elapsed:10,.0f} events/s")
+
+
+async def _run(redis_url: str, rounds: int, batch: int, window: float) -> None:
+    redis = Redis.from_url(redis_url)
+    messages = [
+        (
+            f"operator:{i}",
+            _BenchPayload(
+                event=_BenchEventType.status, data={"appeal_id": i, "status": "open"}
+            ),
+        )
+        for i in range(batch)
+    ]
+    publisher = EventPublisher(redis)
+    batched = EventPublisher(redis, batch_window=window)
+
+    async def per_call() -> None:
+        for channel, payload in messages:
+            await publisher.publish_payload(channel=channel, payload=payload)
+
+    async def concurrent() -> None:
+        await asyncio.gather(
+            *(publisher.publish_payload(channel=c, payload=p) for c, p in messages)
+        )
+
+    async def many() -> None:
+        await publisher.publish_many(messages)
+
+    async def micro_batched() -> None:
+        await asyncio.gather(
+            *(batched.publish_payload(channel=c, payload=p) for c, p in messages)
+        )
+
+    try:
+        await per_call()
+        await _measure("per-call", rounds, batch, per_call)
+        await _measure("concurrent", rounds, batch, concurrent)
+        await _measure("publish_many", rounds, batch, many)
+        await _measure("micro-batched", rounds, batch, micro_batched)
+    finally:
+        await redis.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=50, help="events per round")
+    parser.add_argument(
+        "--window", type=float, default=0.0, help="batch_window in seconds"
+    )
+    args = parser.parse_args()
+    asyncio.run(_run(args.redis_url, args.rounds, args.batch, args.window))
+
+
+if __name__ == "__main__":
+    main()
@@ -101,7 +101,9 @@ class ConnectionPool:
             self._connection = await connect_robust(self._broker_host_url)
             return self._connection
 
-    async def acquire_channel(self, prefetch_count: int | None = None) -> Channel:
+    async def acquire_channel(
+        self, prefetch_count: int | None = None, publisher_confirms: bool = True
+    ) -> Channel:
         """
         Open a new channel on the shared connection.
 
@@ -109,7 +111,7 @@ class ConnectionPool:
         Each consumer / producer should hold its own channel.
         """
         connection = await self._ensure_connection()
-        channel = await connection.channel()
+        channel = await connection.channel(publisher_confirms=publisher_confirms)
         if prefetch_count is not None:
             await channel.set_qos(prefetch_count=prefetch_count)
         return channel
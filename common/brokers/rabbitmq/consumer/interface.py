@@ -1,10 +1,19 @@
-import json
 import asyncio
 import logging
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, List
 
-from aio_pika import Channel, Queue
+from aio_pika import Channel, DeliveryMode, Message, Queue
+from aio_pika.abc import AbstractIncomingMessage
 
 from common.brokers.rabbitmq.connection_pool import ConnectionPool
+from common.brokers.rabbitmq.retry import (
+    ERROR_HEADER,
+    RETRY_COUNT_HEADER,
+    RetryPolicy,
+    retry_count,
+)
+from common.brokers.tasks.codec import JsonLoads, decode_task
 from common.brokers.tasks.schema import Task
 
 
@@ -15,15 +24,35 @@ class ConsumerBasicInterface:
     # hide forever behind a silent reconnect loop.
     MAX_CONSECUTIVE_CONNECT_FAILURES = 20
 
-    def __init__(self, broker_host_url: str, queue_name: str, logger: logging.Logger, prefetch_count: int = 1):
+    def __init__(
+        self,
+        broker_host_url: str,
+        queue_name: str,
+        logger: logging.Logger,
+        prefetch_count: int = 1,
+        json_loads: JsonLoads | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ):
+        """
+        ``json_loads`` replaces the default JSON backend (orjson when installed).
+
+        With ``retry_policy``, messages that cannot be decoded go to the
+        ``{queue_name}.dlq`` dead-letter queue instead of being dropped, and
+        failed ``run()`` handlers, tasks abandoned by a ``get_messages()``
+        caller, and abandoned ``get_batches()`` batches are redelivered after a
+        delay; see ``common.brokers.rabbitmq.retry``.
+        """
         self._broker_host_url = broker_host_url
         self._queue_name = queue_name
         self._prefetch_count = prefetch_count
         self._channel: Channel | None = None
         self._queue: Queue | None = None
         self._stopped = False
+        self._run_stop: asyncio.Event | None = None
         self._logger = logger
         self._consecutive_connect_failures = 0
+        self._json_loads = json_loads
+        self._retry_policy = retry_policy
 
     @property
     def has_connection(self) -> bool:
@@ -32,22 +61,22 @@ class ConsumerBasicInterface:
     def __getstate__(self):
         st = self.__dict__.copy()
         st.pop("_lock", None)
+        st.pop("_run_stop", None)
         return st
 
     def __setstate__(self, st):
         self.__dict__.update(st)
         self._lock = asyncio.Lock()
+        self._run_stop = None
 
     async def close(self) -> None:
         self._stopped = True
-
-        if self._channel and not self._channel.is_closed:
-            try:
-                await self._channel.close()
-            except Exception:
-                pass
-            self._channel = None
-            self._queue = None
+        if self._run_stop is not None:
+            # run() lets its workers settle in-flight messages, then drops the
+            # channel itself.
+            self._run_stop.set()
+            return
+        await self._drop_channel()
 
     async def connect(self) -> None:
         """Acquire a channel from the shared connection pool."""
@@ -60,6 +89,8 @@ class ConsumerBasicInterface:
                 self._queue = await self._channel.declare_queue(
                     self._queue_name, durable=True
                 )
+                if self._retry_policy is not None:
+                    await self._declare_retry_queues()
                 # Successful connect — reset failure counter.
                 self._consecutive_connect_failures = 0
             except Exception as exc:
@@ -101,19 +132,36 @@ class ConsumerBasicInterface:
                         if self._stopped:
                             break
 
-                        async with message.process():
+                        # ignore_processed: the retry path below settles the
+                        # message itself before process() sees the exception.
+                        async with message.process(ignore_processed=True):
                             try:
-                                raw_str = message.body.decode("utf-8")
-                                payload = json.loads(raw_str)
-
-                                if isinstance(payload, str):
-                                    task_dict = json.loads(payload)
-                                else:
-                                    task_dict = payload
+                                task = self._parse_task(message)
+                            except ValueError as e:
+                                self._logger.error(f"Task decode error: {e}")
+                                await self._dead_letter(message, e)
+                                continue
 
-                                yield Task(**task_dict)
-                            except json.JSONDecodeError as e:
-                                self._logger.error(f"JSON decode error: {e}")
+                            try:
+                                yield task
+                            except BaseException as e:
+                                # A handler error thrown in with athrow(), or
+                                # GeneratorExit when the caller stopped mid-task.
+                                if self._retry_policy is None:
+                                    raise
+                                error = e
+                                if not isinstance(e, Exception):
+                                    error = RuntimeError("task was not completed")
+                                try:
+                                    await self._retry(message, error)
+                                    await message.ack()
+                                except Exception as retry_error:
+                                    self._logger.warning(
+                                        "Failed to schedule retry: %s", retry_error
+                                    )
+                                    raise e
+                                if not isinstance(e, Exception):
+                                    raise
 
             except Exception as e:
                 self._logger.warning("Error during messages receiving %s", e)
@@ -127,3 +175,292 @@ class ConsumerBasicInterface:
                 self._queue = None
 
             await asyncio.sleep(1.0)
+
+    async def get_batches(
+        self, max_size: int = 100, max_wait: float = 1.0
+    ) -> AsyncIterator[List[Task]]:
+        """
+        Yield lists of up to ``max_size`` Tasks. A batch is yielded once it is
+        full or ``max_wait`` seconds after its first message arrived.
+
+        The batch is acknowledged with a single multiple-ack when the caller
+        asks for the next one, i.e. after it has handled this one; if iteration
+        is abandoned instead, the batch is requeued. Prefetch is raised to
+        ``max_size`` so a full batch can be delivered. Malformed messages are
+        logged and acknowledged together with the batch.
+        """
+        self._prefetch_count = max(self._prefetch_count, max_size)
+
+        while not self._stopped:
+            await self.connect()
+            if not self.has_connection or not self._queue:
+                await asyncio.sleep(self.RECONNECT_DELAY)
+                continue
+
+            inbox: asyncio.Queue = asyncio.Queue()
+            consumer_tag = None
+            try:
+                await self._channel.set_qos(prefetch_count=self._prefetch_count)
+                consumer_tag = await self._queue.consume(inbox.put)
+
+                while not self._stopped and self.has_connection:
+                    messages = await self._collect(inbox, max_size, max_wait)
+                    if not messages:
+                        continue
+
+                    tasks, decoded = [], []
+                    for message in messages:
+                        try:
+                            tasks.append(self._parse_task(message))
+                            decoded.append(message)
+                        except ValueError as e:
+                            self._logger.error(f"Malformed task message: {e}")
+                            await self._dead_letter(message, e)
+
+                    if tasks:
+                        try:
+                            yield tasks
+                        except BaseException:
+                            if self._retry_policy is None:
+                                await messages[-1].nack(multiple=True, requeue=True)
+                                raise
+                            error = RuntimeError("batch was not completed")
+                            for message in decoded:
+                                await self._retry(message, error)
+                            await messages[-1].ack(multiple=True)
+                            raise
+                    await messages[-1].ack(multiple=True)
+
+                if not self._stopped:
+                    # Lost the channel: drop it so a self-restoring robust
+                    # channel cannot keep feeding an inbox nobody reads.
+                    await self._drop_channel()
+
+            except Exception as e:
+                self._logger.warning("Error during batch receiving %s", e)
+                await self._drop_channel()
+            finally:
+                await self._cancel_consumer(consumer_tag, inbox)
+
+            await asyncio.sleep(1.0)
+
+    async def _drop_channel(self) -> None:
+        """
+        Close the current channel even if it already looks closed: closing a
+        robust channel explicitly stops it from reopening and restoring its
+        consumers.
+        """
+        channel, self._channel, self._queue = self._channel, None, None
+        if channel is not None:
+            try:
+                await channel.close()
+            except Exception:
+                pass
+
+    async def _collect(
+        self, inbox: asyncio.Queue, max_size: int, max_wait: float
+    ) -> List[AbstractIncomingMessage]:
+        """Wait for a first message, then fill the batch until full or ``max_wait``."""
+        try:
+            batch = [await asyncio.wait_for(inbox.get(), timeout=self.RECONNECT_DELAY)]
+        except asyncio.TimeoutError:
+            return []
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        while len(batch) < max_size:
+            if not inbox.empty():
+                batch.append(inbox.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(inbox.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(
+        self,
+        handler: Callable[[Task], Any],
+        concurrency: int = 1,
+        executor: Executor | None = None,
+    ) -> None:
+        """
+        Consume until ``close()``, running up to ``concurrency`` handlers at once.
+
+        Each message is acknowledged when its handler returns and rejected
+        without requeue when it raises, like ``get_messages``. ``handler`` is a
+        coroutine function, or with ``executor`` (a thread or process pool for
+        CPU-bound work such as transcription) a plain function run there; a
+        process pool needs a picklable, module-level function. Prefetch is
+        raised to ``concurrency`` so every worker has a message to work on.
+
+        ``close()`` during ``run()`` stops consuming and lets the workers
+        finish and acknowledge what was already delivered before the channel
+        is closed.
+        """
+        self._prefetch_count = max(self._prefetch_count, concurrency)
+        self._run_stop = asyncio.Event()
+
+        try:
+            while not self._stopped:
+                await self.connect()
+                if not self.has_connection or not self._queue:
+                    await asyncio.sleep(self.RECONNECT_DELAY)
+                    continue
+
+                inbox: asyncio.Queue = asyncio.Queue()
+                consumer_tag = None
+                workers = [
+                    asyncio.create_task(self._worker(inbox, handler, executor))
+                    for _ in range(concurrency)
+                ]
+                try:
+                    await self._channel.set_qos(prefetch_count=self._prefetch_count)
+                    consumer_tag = await self._queue.consume(inbox.put)
+
+                    while not self._stopped and self.has_connection:
+                        try:
+                            await asyncio.wait_for(self._run_stop.wait(), 1.0)
+                        except asyncio.TimeoutError:
+                            pass
+
+                    if not self._stopped:
+                        await self._drop_channel()
+
+                except Exception as e:
+                    self._logger.warning("Error during messages receiving %s", e)
+                    await self._drop_channel()
+                finally:
+                    await self._cancel_consumer(consumer_tag)
+                    # Workers drain what was already delivered, then exit.
+                    for _ in workers:
+                        inbox.put_nowait(None)
+                    await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            self._run_stop = None
+            if self._stopped:
+                await self._drop_channel()
+
+    async def _worker(
+        self,
+        inbox: asyncio.Queue,
+        handler: Callable[[Task], Any],
+        executor: Executor | None,
+    ) -> None:
+        while True:
+            message = await inbox.get()
+            if message is None:
+                return
+            # Without a channel the ack is impossible and the broker redelivers.
+            if self.has_connection:
+                await self._handle(message, handler, executor)
+
+    async def _handle(
+        self,
+        message: AbstractIncomingMessage,
+        handler: Callable[[Task], Any],
+        executor: Executor | None,
+    ) -> None:
+        try:
+            try:
+                task = self._parse_task(message)
+            except ValueError as e:
+                self._logger.error(f"Malformed task message: {e}")
+                await self._dead_letter(message, e)
+                await message.ack()
+                return
+
+            try:
+                if executor is None:
+                    await handler(task)
+                else:
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(executor, handler, task)
+            except Exception as e:
+                self._logger.error(f"Task {task.id} handler failed: {e}")
+                if self._retry_policy is None:
+                    await message.reject(requeue=False)
+                else:
+                    await self._retry(message, e)
+                    await message.ack()
+                return
+
+            await message.ack()
+        except Exception as e:
+            self._logger.warning("Failed to settle message: %s", e)
+
+    async def _cancel_consumer(
+        self, consumer_tag, inbox: asyncio.Queue | None = None
+    ) -> None:
+        """Stop consuming and hand back prefetched messages nobody took."""
+        if consumer_tag is None or not self.has_connection:
+            return
+        try:
+            await self._queue.cancel(consumer_tag)
+            leftover = None
+            while inbox is not None and not inbox.empty():
+                leftover = inbox.get_nowait()
+            if leftover is not None:
+                await leftover.nack(multiple=True, requeue=True)
+        except Exception:
+            pass
+
+    def _parse_task(self, message: AbstractIncomingMessage) -> Task:
+        return decode_task(message.body, message.headers, self._json_loads)
+
+    async def _declare_retry_queues(self) -> None:
+        policy = self._retry_policy
+        await self._channel.declare_queue(
+            policy.dead_letter_queue(self._queue_name), durable=True
+        )
+        for name, arguments in policy.retry_queues(self._queue_name).items():
+            await self._channel.declare_queue(name, durable=True, arguments=arguments)
+
+    async def _retry(self, message: AbstractIncomingMessage, error: BaseException) -> None:
+        """Republish to the retry queue for the next attempt, or dead-letter it."""
+        retry = retry_count(message.headers) + 1
+        if not self._retry_policy.should_retry(retry, error):
+            await self._dead_letter(message, error)
+            return
+
+        delay_ms = self._retry_policy.delay_ms(retry)
+        await self._republish(
+            message,
+            self._retry_policy.retry_queue(self._queue_name, delay_ms),
+            {RETRY_COUNT_HEADER: retry, ERROR_HEADER: repr(error)[:1000]},
+        )
+
+    async def _dead_letter(self, message: AbstractIncomingMessage, error: BaseException) -> None:
+        """Park ``message`` in the dead-letter queue; the caller still settles it."""
+        if self._retry_policy is None:
+            return
+        self._logger.warning(
+            "Dead-lettering message from %s after %d retries: %r",
+            self._queue_name,
+            retry_count(message.headers),
+            error,
+        )
+        await self._republish(
+            message,
+            self._retry_policy.dead_letter_queue(self._queue_name),
+            {ERROR_HEADER: repr(error)[:1000]},
+        )
+
+    async def _republish(
+        self, message: AbstractIncomingMessage, queue_name: str, headers: dict
+    ) -> None:
+        await self._channel.default_exchange.publish(
+            Message(
+                body=message.body,
+                headers={**(message.headers or {}), **headers},
+                content_type=message.content_type,
+                content_encoding=message.content_encoding,
+                message_id=message.message_id,
+                correlation_id=message.correlation_id,
+                delivery_mode=DeliveryMode.PERSISTENT,
+            ),
+            routing_key=queue_name,
+        )
@@ -1,19 +1,40 @@
-import json
 import asyncio
 import logging
+from typing import Any, Iterable, List, Set
 
+import aiormq
 from aio_pika import ExchangeType, Message
 
 from common.brokers.rabbitmq.connection_pool import ConnectionPool
+from common.brokers.tasks.codec import ENCODING_HEADER, JSON_ENCODING, encode_task
 
 
 class ProducerBasicInterface:
-    def __init__(self, broker_host_url: str, logger: logging.Logger):
+    def __init__(
+        self,
+        broker_host_url: str,
+        logger: logging.Logger,
+        publisher_confirms: bool = True,
+        max_in_flight: int = 1000,
+    ):
+        """
+        With ``publisher_confirms`` a task counts as sent only once the broker
+        has confirmed it. Publishes are pipelined: up to ``max_in_flight``
+        may await their confirm at the same time (``send_tasks``,
+        ``send_task_nowait``).
+        """
         self._broker_host_url = broker_host_url
         self.__channel = None
         self._exchange = None
         self._logger = logger
         self._lock = asyncio.Lock()
+        self._publisher_confirms = publisher_confirms
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._pending: Set[asyncio.Task] = set()
+        # Worker queues declared and bound on ``_bound_channel``; a new channel
+        # starts with an empty set.
+        self._bound_workers: Set[str] = set()
+        self._bound_channel = None
 
     @property
     def has_connection(self) -> bool:
@@ -39,7 +60,9 @@ class ProducerBasicInterface:
 
             try:
                 pool = await ConnectionPool.get_instance(self._broker_host_url)
-                self.__channel = await pool.acquire_channel()
+                self.__channel = await pool.acquire_channel(
+                    publisher_confirms=self._publisher_confirms
+                )
                 self._exchange = await self.__channel.declare_exchange(
                     "DirectExchange", ExchangeType.DIRECT, durable=True
                 )
@@ -48,34 +71,120 @@ class ProducerBasicInterface:
                 self.__channel = None
                 self._exchange = None
 
-    async def send_task(self, worker: str, task_payload: dict):
+    async def send_task(self, worker: str, task_payload: dict) -> bool:
+        """
+        ``task_payload`` is a task dict, a Task, or already serialized task JSON;
+        it is encoded exactly once and marked with the encoding header.
+        Returns True once the task is sent (confirmed, with confirms enabled).
+        """
+        if not await self._prepare(worker):
+            return False
+        return await self._publish(worker, task_payload)
+
+    async def send_tasks(self, worker: str, tasks: Iterable[Any]) -> List[Any]:
+        """
+        Publish many tasks to ``worker`` with their confirms in flight together.
+        Returns the tasks that were not confirmed, in order, so the caller can
+        retry them.
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        if not await self._prepare(worker):
+            return tasks
+
+        results = await asyncio.gather(*(self._publish(worker, t) for t in tasks))
+        return [task for task, ok in zip(tasks, results) if not ok]
+
+    def send_task_nowait(self, worker: str, task_payload: dict) -> asyncio.Task:
+        """Start ``send_task`` in the background; ``flush()`` waits for it."""
+        task = asyncio.ensure_future(self.send_task(worker, task_payload))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return task
+
+    async def flush(self) -> bool:
+        """Wait for every ``send_task_nowait`` publish; True if all were confirmed."""
+        ok = True
+        while self._pending:
+            results = await asyncio.gather(*list(self._pending))
+            ok = ok and all(results)
+        return ok
+
+    async def _prepare(self, worker: str) -> bool:
         if not (self.has_channel and self._exchange):
             await self.connect()
 
         if not self.__channel:
             self._logger.error("Failed to establish connection, cannot send message")
-            return
+            return False
 
+        if self._bound_channel is not self.__channel:
+            self._bound_channel = self.__channel
+            self._bound_workers = set()
+        if worker in self._bound_workers:
+            return True
+
+        channel = self.__channel
         try:
-            queue = await self.__channel.declare_queue(name=worker, durable=True)
+            queue = await channel.declare_queue(name=worker, durable=True)
             await queue.bind(self._exchange, routing_key=worker)
+            self._bound_workers.add(worker)
+            return True
+        except Exception as e:
+            self._logger.error(f"Failed to send task: {e}")
+            await self._reset(channel)
+            return False
 
+    async def _publish(self, worker: str, task_payload: Any) -> bool:
+        try:
             message = Message(
-                body=json.dumps(task_payload).encode("utf-8"),
+                body=encode_task(task_payload),
                 content_type="application/json",
+                headers={ENCODING_HEADER: JSON_ENCODING},
                 delivery_mode=2
             )
-
-            await self._exchange.publish(message, routing_key=worker)
-
         except Exception as e:
-            self._logger.error(f"Failed to send task: {e}")
+            self._logger.error(f"Failed to encode task for {worker}: {e}")
+            return False
+
+        async with self._in_flight:
+            channel, exchange = self.__channel, self._exchange
+            if exchange is None:
+                return False
             try:
-                await self.__channel.close()
-            except Exception:
-                pass
-            self.__channel = None
-            self._exchange = None
+                confirmation = await exchange.publish(message, routing_key=worker)
+            except aiormq.exceptions.DeliveryError as e:
+                # Nacked by the broker; the channel itself is still usable.
+                self._logger.error(f"Task to {worker} was rejected: {e!r}")
+                return False
+            except Exception as e:
+                self._logger.error(f"Failed to send task: {e}")
+                await self._reset(channel)
+                return False
+
+        if self._publisher_confirms and not isinstance(
+            confirmation, aiormq.spec.Basic.Ack
+        ):
+            self._logger.error(f"Task to {worker} was returned by the broker as unroutable")
+            # The queue or binding was removed behind our back; redeclare next time.
+            self._bound_workers.discard(worker)
+            return False
+        return True
+
+    async def _reset(self, channel) -> None:
+        """
+        Drop ``channel`` if it is still the current one. A pipelined publish
+        that failed on an older channel must not close the channel another
+        coroutine has opened since.
+        """
+        if channel is None or channel is not self.__channel:
+            return
+        self.__channel, self._exchange = None, None
+        try:
+            await channel.close()
+        except Exception:
+            pass
 
     async def close(self):
         """Close this producer's channel. Does NOT close the shared connection."""
@@ -0,0 +1,71 @@
+"""
+Delayed retries and dead-lettering for task consumers.
+
+For a queue ``Q`` the consumer declares:
+
+- ``Q.retry.{delay_ms}`` for every configured delay: durable queues with a
+  fixed ``x-message-ttl`` whose expired messages are dead-lettered back to
+  ``Q`` through the default exchange. One queue per delay keeps every message
+  in a queue expiring in order, so nothing waits behind a longer TTL.
+- ``Q.dlq``: where messages end up after ``max_retries`` failed redeliveries,
+  on a non-retryable error, or when they cannot be decoded at all.
+
+Failed messages are republished with an incremented ``x-retry-count`` header
+and the original is acknowledged, so ``Q`` itself keeps its existing
+arguments and needs no redeclaration.
+"""
+
+from typing import Any, Mapping, Sequence, Tuple, Type
+
+RETRY_COUNT_HEADER = "x-retry-count"
+ERROR_HEADER = "x-last-error"
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int = 5,
+        delays: Sequence[float] = (5, 30, 120, 600),
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    ):
+        """
+        ``delays`` are seconds before retry 1, 2, ...; the last one repeats.
+        Exceptions not matching ``retry_on`` are dead-lettered immediately.
+        """
+        if not delays:
+            raise ValueError("delays must not be empty")
+        self.max_retries = max_retries
+        self.delays = tuple(delays)
+        self.retry_on = retry_on
+
+    def delay_ms(self, retry: int) -> int:
+        return int(self.delays[min(retry, len(self.delays)) - 1] * 1000)
+
+    def should_retry(self, retry: int, error: BaseException) -> bool:
+        return retry <= self.max_retries and isinstance(error, self.retry_on)
+
+    @staticmethod
+    def retry_queue(queue_name: str, delay_ms: int) -> str:
+        return f"{queue_name}.retry.{delay_ms}"
+
+    @staticmethod
+    def dead_letter_queue(queue_name: str) -> str:
+        return f"{queue_name}.dlq"
+
+    def retry_queues(self, queue_name: str) -> dict:
+        """``name -> queue arguments`` for every retry queue of ``queue_name``."""
+        return {
+            self.retry_queue(queue_name, delay_ms): {
+                "x-message-ttl": delay_ms,
+                "x-dead-letter-exchange": "",
+                "x-dead-letter-routing-key": queue_name,
+            }
+            for delay_ms in sorted({int(d * 1000) for d in self.delays})
+        }
+
+
+def retry_count(headers: Mapping[str, Any] | None) -> int:
+    try:
+        return int((headers or {}).get(RETRY_COUNT_HEADER, 0))
+    except (TypeError, ValueError):
+        return 0
@@ -0,0 +1,66 @@
+"""
+Wire format of Tasks on the broker.
+
+Producers mark bodies that are exactly one JSON document of a Task with the
+``x-task-encoding: json`` header; consumers parse those once, without the
+double-decoding check (with ``Task.model_validate_json`` when orjson is not
+installed). Unmarked bodies come from older
+producers and may be double-encoded (a JSON string holding the task JSON), so
+they go through the legacy path, which unwraps that.
+"""
+
+import json
+from typing import Any, Callable, Mapping
+
+from common.brokers.tasks.schema import Task
+
+try:
+    import orjson
+    _has_orjson = True
+except ImportError:
+    _has_orjson = False
+
+ENCODING_HEADER = "x-task-encoding"
+JSON_ENCODING = "json"
+
+JsonLoads = Callable[[bytes | str], Any]
+
+
+def default_json_loads() -> JsonLoads:
+    return orjson.loads if _has_orjson else json.loads
+
+
+def encode_task(task: Task | Mapping[str, Any] | str | bytes) -> bytes:
+    """Encode a Task, a task dict or already serialized task JSON exactly once."""
+    if isinstance(task, Task):
+        return task.model_dump_json().encode("utf-8")
+    if isinstance(task, bytes):
+        return task
+    if isinstance(task, str):
+        return task.encode("utf-8")
+    if _has_orjson:
+        return orjson.dumps(task, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(task).encode("utf-8")
+
+
+def decode_task(
+    body: bytes,
+    headers: Mapping[str, Any] | None = None,
+    json_loads: JsonLoads | None = None,
+) -> Task:
+    """Raise ``ValueError`` (JSON or validation error) for malformed bodies."""
+    encoding = (headers or {}).get(ENCODING_HEADER)
+    if isinstance(encoding, bytes):
+        encoding = encoding.decode()
+    marked = encoding == JSON_ENCODING
+
+    if json_loads is None:
+        if marked and not _has_orjson:
+            # pydantic's own parser beats json.loads + model_validate.
+            return Task.model_validate_json(body)
+        json_loads = default_json_loads()
+
+    payload = json_loads(body)
+    if isinstance(payload, str) and not marked:
+        payload = json_loads(payload)
+    return Task.model_validate(payload)
@@ -1,5 +1,27 @@
-from .publisher import OctopusPublisher
-from .context import OctopusContext
+from .publisher import OctopusPublisher, AsyncOctopusPublisher, StreamOptions
+from .context import OctopusContext, AsyncOctopusContext, LazyContext
 from .event import OctopusEvent
+from .serializers import (
+    OctopusSerializer,
+    JsonOctopusSerializer,
+    OrjsonOctopusSerializer,
+    MsgpackOctopusSerializer,
+    default_serializer,
+)
+from .consumer import OctopusConsumer
 
-__all__ = ["OctopusPublisher", "OctopusContext", "OctopusEvent"]
+__all__ = [
+    "OctopusPublisher",
+    "AsyncOctopusPublisher",
+    "StreamOptions",
+    "OctopusContext",
+    "AsyncOctopusContext",
+    "LazyContext",
+    "OctopusEvent",
+    "OctopusSerializer",
+    "JsonOctopusSerializer",
+    "OrjsonOctopusSerializer",
+    "MsgpackOctopusSerializer",
+    "default_serializer",
+    "OctopusConsumer",
+]
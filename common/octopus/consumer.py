@@ -0,0 +1,252 @@
+import asyncio
+import logging
+import os
+import socket
+from typing import Awaitable, Callable, Dict, Iterable, List, Set, Tuple
+
+from redis import asyncio as aioredis
+from redis.exceptions import ResponseError
+
+from common.octopus.event import OctopusEvent
+from common.octopus.publisher import StreamOptions
+from common.octopus.serializers import OctopusSerializer, default_serializer
+
+logger = logging.getLogger("octopus.consumer")
+
+Handler = Callable[[OctopusEvent], Awaitable[None]]
+
+
+class OctopusConsumer:
+    """
+    Consumer-group reader for ``octopus:events:{company_id}`` streams.
+
+    One XREADGROUP call reads up to ``batch_size`` entries per stream across
+    all known streams. Entries are dispatched to handlers with at most
+    ``concurrency`` running at once, and successfully handled ones are
+    acknowledged in bulk. Entries whose handler failed stay pending and are
+    re-claimed (XAUTOCLAIM) once idle for ``claim_idle_ms``. Ordering within a
+    company is not guaranteed.
+
+    Streams come from ``company_ids`` (expanded to every shard according to
+    ``options``) and, with ``discover=True``, from a periodic SCAN of
+    ``octopus:events:*``.
+    """
+
+    STREAM_PREFIX = "octopus:events:"
+
+    def __init__(
+        self,
+        client: aioredis.Redis,
+        *,
+        group: str,
+        consumer: str | None = None,
+        company_ids: Iterable[int] = (),
+        discover: bool = True,
+        batch_size: int = 100,
+        block_ms: int = 1000,
+        concurrency: int = 16,
+        claim_idle_ms: int = 60000,
+        maintenance_interval: float = 30.0,
+        start_id: str = "0",
+        options: StreamOptions | None = None,
+        serializer: OctopusSerializer | None = None,
+    ):
+        self._client = client
+        self._group = group
+        self._consumer = consumer or f"{socket.gethostname()}:{os.getpid()}"
+        self._discover = discover
+        self._batch_size = batch_size
+        self._block_ms = block_ms
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._claim_idle_ms = claim_idle_ms
+        self._maintenance_interval = maintenance_interval
+        self._start_id = start_id
+        self._options = options or StreamOptions()
+        self._serializer = serializer or default_serializer()
+        self._streams: Set[str] = set()
+        self._pending_streams: Set[str] = set()
+        self.add_companies(company_ids)
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._stopped = False
+        self.handled = 0
+        self.failed = 0
+        self.claimed = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "streams": len(self._streams),
+            "handled": self.handled,
+            "failed": self.failed,
+            "claimed": self.claimed,
+        }
+
+    def add_handler(self, event_type: str, handler: Handler) -> None:
+        """Register ``handler`` for ``event_type``; ``"*"`` receives every event."""
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def on(self, event_type: str) -> Callable[[Handler], Handler]:
+        def decorator(handler: Handler) -> Handler:
+            self.add_handler(event_type, handler)
+            return handler
+
+        return decorator
+
+    def add_companies(self, company_ids: Iterable[int]) -> None:
+        for company_id in company_ids:
+            for key in self._options.stream_keys(company_id):
+                if key not in self._streams:
+                    self._pending_streams.add(key)
+
+    async def stop(self) -> None:
+        self._stopped = True
+
+    async def run(self) -> None:
+        """Consume until ``stop()`` is called."""
+        self._stopped = False
+        await self._maintain()
+        loop = asyncio.get_running_loop()
+        next_maintenance = loop.time() + self._maintenance_interval
+
+        while not self._stopped:
+            if loop.time() >= next_maintenance:
+                await self._maintain()
+                next_maintenance = loop.time() + self._maintenance_interval
+
+            await self._register_pending_streams()
+            if not self._streams:
+                await asyncio.sleep(self._block_ms / 1000)
+                continue
+
+            try:
+                response = await self._client.xreadgroup(
+                    self._group,
+                    self._consumer,
+                    {stream: ">" for stream in self._streams},
+                    count=self._batch_size,
+                    block=self._block_ms,
+                )
+            except ResponseError as exc:
+                # NOGROUP: a stream was deleted (e.g. trimmed to nothing and expired).
+                logger.warning("Octopus: xreadgroup failed: %s", exc)
+                self._pending_streams.update(self._streams)
+                self._streams.clear()
+                continue
+            except Exception as exc:
+                logger.warning("Octopus: xreadgroup failed: %s", exc)
+                await asyncio.sleep(1.0)
+                continue
+
+            entries = [
+                (_text(stream), _text(entry_id), fields)
+                for stream, stream_entries in response or []
+                for entry_id, fields in stream_entries
+            ]
+            await self._process(entries)
+
+    async def _process(self, entries: List[Tuple[str, str, dict]]) -> None:
+        if not entries:
+            return
+
+        results = await asyncio.gather(
+            *(self._dispatch(fields) for _, _, fields in entries)
+        )
+
+        to_ack: Dict[str, List[str]] = {}
+        for (stream, entry_id, _), ok in zip(entries, results):
+            if ok:
+                to_ack.setdefault(stream, []).append(entry_id)
+
+        if not to_ack:
+            return
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for stream, ids in to_ack.items():
+                    pipe.xack(stream, self._group, *ids)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Octopus: xack failed: %s", exc)
+
+    async def _dispatch(self, fields: dict) -> bool:
+        try:
+            raw = fields.get("event", fields.get(b"event"))
+            event = self._serializer.loads(raw)
+        except Exception as exc:
+            # Malformed entries can never succeed; ack them so they do not loop.
+            logger.warning("Octopus: malformed event %r: %s", fields, exc)
+            return True
+
+        handlers = self._handlers.get(event.type, []) + self._handlers.get("*", [])
+        async with self._semaphore:
+            try:
+                for handler in handlers:
+                    await handler(event)
+            except Exception as exc:
+                logger.warning("Octopus: handler failed for %s: %s", event.type, exc)
+                self.failed += 1
+                return False
+        self.handled += 1
+        return True
+
+    async def _maintain(self) -> None:
+        if self._discover:
+            try:
+                async for key in self._client.scan_iter(
+                    match=f"{self.STREAM_PREFIX}*", count=1000, _type="stream"
+                ):
+                    key = _text(key)
+                    if key not in self._streams:
+                        self._pending_streams.add(key)
+            except Exception as exc:
+                logger.warning("Octopus: stream discovery failed: %s", exc)
+
+        await self._register_pending_streams()
+        for stream in list(self._streams):
+            await self._claim_stale(stream)
+
+    async def _register_pending_streams(self) -> None:
+        while self._pending_streams:
+            stream = self._pending_streams.pop()
+            try:
+                await self._client.xgroup_create(
+                    stream, self._group, id=self._start_id, mkstream=True
+                )
+            except ResponseError as exc:
+                if "BUSYGROUP" not in str(exc):
+                    logger.warning("Octopus: xgroup create failed for %s: %s", stream, exc)
+                    continue
+            except Exception as exc:
+                logger.warning("Octopus: xgroup create failed for %s: %s", stream, exc)
+                self._pending_streams.add(stream)
+                return
+            self._streams.add(stream)
+
+    async def _claim_stale(self, stream: str) -> None:
+        start = "0-0"
+        try:
+            while not self._stopped:
+                response = await self._client.xautoclaim(
+                    stream,
+                    self._group,
+                    self._consumer,
+                    min_idle_time=self._claim_idle_ms,
+                    start_id=start,
+                    count=self._batch_size,
+                )
+                start, claimed = _text(response[0]), response[1]
+                deleted = [entry_id for entry_id, fields in claimed if not fields]
+                if deleted:
+                    await self._client.xack(stream, self._group, *deleted)
+                claimed = [(entry_id, fields) for entry_id, fields in claimed if fields]
+                self.claimed += len(claimed)
+                await self._process(
+                    [(stream, _text(entry_id), fields) for entry_id, fields in claimed]
+                )
+                if start == "0-0":
+                    break
+        except Exception as exc:
+            logger.warning("Octopus: xautoclaim failed for %s: %s", stream, exc)
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
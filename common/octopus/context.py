@@ -1,6 +1,11 @@
 import json
 import logging
+import time
+from collections.abc import Mapping
+from typing import Dict, Iterable
+
 import redis
+from redis import asyncio as aioredis
 
 logger = logging.getLogger("octopus.context")
 
@@ -14,10 +19,14 @@ class OctopusContext:
         "system_health", "utm_clicks_24h",
     ]
 
-    def __init__(self, redis_url: str = "", redis_db: int = 1):
+    def __init__(
+        self, redis_url: str = "", redis_db: int = 1, client: redis.Redis | None = None
+    ):
+        """``client`` is a shared decode_responses=True client, e.g. from RedisPoolRegistry."""
         self._redis_url = redis_url
         self._redis_db = redis_db
-        self._client = None
+        self._shared_client = client
+        self._client = client
 
     def _get_client(self):
         if self._client is None:
@@ -49,20 +58,199 @@ class OctopusContext:
             return result
         except Exception as exc:
             logger.warning("Octopus: context read failed for company %s: %s", company_id, exc)
-            self._client = None
+            self._client = self._shared_client
             return {}
 
     def set_field(self, company_id: int, field: str, value, ttl: int = 3600) -> bool:
         """Update a single context field. Used by the consumer."""
+        return self.set_many({company_id: {field: value}}, ttl=ttl)
+
+    def set_fields(self, company_id: int, mapping: dict, ttl: int = 3600) -> bool:
+        """Update several fields of one company in a single round trip."""
+        return self.set_many({company_id: mapping}, ttl=ttl)
+
+    def set_many(self, updates: dict, ttl: int = 3600) -> bool:
+        """Apply ``{company_id: {field: value}}`` in one MULTI/EXEC transaction."""
         try:
             client = self._get_client()
             if not client:
                 return False
-            key = f"octopus:context:{company_id}"
-            client.hset(key, field, json.dumps(value, ensure_ascii=False, default=str))
-            client.expire(key, ttl)
+            pipe = client.pipeline(transaction=True)
+            _queue_context_writes(pipe, updates, ttl)
+            pipe.execute()
             return True
         except Exception as exc:
-            logger.warning("Octopus: set_field failed: %s", exc)
-            self._client = None
+            logger.warning("Octopus: set_many failed: %s", exc)
+            self._client = self._shared_client
             return False
+
+
+def _queue_context_writes(pipe, updates: dict, ttl: int) -> None:
+    for company_id, mapping in updates.items():
+        if not mapping:
+            continue
+        key = f"octopus:context:{company_id}"
+        pipe.hset(key, mapping={
+            field: json.dumps(value, ensure_ascii=False, default=str)
+            for field, value in mapping.items()
+        })
+        pipe.expire(key, ttl)
+
+
+def _decode(value):
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return value
+
+
+class LazyContext(Mapping):
+    """Read-only view of context fields; each field is JSON-decoded on first access."""
+
+    __slots__ = ("_raw", "_decoded", "_keys")
+
+    def __init__(self, raw: dict, decoded: dict, keys: list):
+        self._raw = raw
+        self._decoded = decoded
+        self._keys = keys
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        if key not in self._decoded:
+            self._decoded[key] = _decode(self._raw[key])
+        return self._decoded[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return f"LazyContext({list(self._keys)})"
+
+
+class _CachedContext:
+    __slots__ = ("fetched_at", "raw", "decoded", "complete")
+
+    def __init__(self):
+        self.fetched_at = time.monotonic()
+        self.raw: dict = {}  # field -> raw string, or None if absent in Redis
+        self.decoded: dict = {}
+        self.complete = False
+
+
+class AsyncOctopusContext:
+    """
+    Async context reader. Fetches only the requested fields (HMGET), decodes
+    them lazily and keeps them per company in-process for ``cache_ttl``
+    seconds. Returns {} on any failure.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = "",
+        redis_db: int = 1,
+        client: aioredis.Redis | None = None,
+        *,
+        cache_ttl: float = 5.0,
+        max_companies: int = 10000,
+    ):
+        self._redis_url = redis_url
+        self._redis_db = redis_db
+        self._shared_client = client
+        self._client = client
+        self._cache_ttl = cache_ttl
+        self._max_companies = max_companies
+        self._cache: Dict[int, _CachedContext] = {}
+
+    def _get_client(self):
+        if self._client is None:
+            try:
+                self._client = aioredis.Redis.from_url(
+                    self._redis_url, db=self._redis_db, decode_responses=True,
+                    socket_connect_timeout=2, socket_timeout=2,
+                )
+            except Exception:
+                return None
+        return self._client
+
+    def invalidate(self, company_id: int | None = None) -> None:
+        if company_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(company_id, None)
+
+    def _entry(self, company_id: int) -> _CachedContext:
+        entry = self._cache.get(company_id)
+        if entry is not None and time.monotonic() - entry.fetched_at < self._cache_ttl:
+            return entry
+
+        entry = _CachedContext()
+        self._cache.pop(company_id, None)
+        self._cache[company_id] = entry
+        while len(self._cache) > self._max_companies:
+            self._cache.pop(next(iter(self._cache)))
+        return entry
+
+    async def set_fields(self, company_id: int, mapping: dict, ttl: int = 3600) -> bool:
+        """Update several fields of one company in a single round trip."""
+        return await self.set_many({company_id: mapping}, ttl=ttl)
+
+    async def set_many(self, updates: dict, ttl: int = 3600) -> bool:
+        """Apply ``{company_id: {field: value}}`` in one MULTI/EXEC transaction."""
+        try:
+            client = self._get_client()
+            if not client:
+                return False
+            async with client.pipeline(transaction=True) as pipe:
+                _queue_context_writes(pipe, updates, ttl)
+                await pipe.execute()
+            for company_id in updates:
+                self._cache.pop(company_id, None)
+            return True
+        except Exception as exc:
+            logger.warning("Octopus: set_many failed: %s", exc)
+            self._client = self._shared_client
+            return False
+
+    async def get(self, company_id: int, fields: Iterable[str] | None = None) -> Mapping:
+        """Get context (all fields, or only ``fields``) for a company."""
+        try:
+            entry = self._entry(company_id)
+            key = f"octopus:context:{company_id}"
+
+            if fields is None:
+                if not entry.complete:
+                    client = self._get_client()
+                    if not client:
+                        return {}
+                    raw = await client.hgetall(key)
+                    entry.decoded = {
+                        k: v for k, v in entry.decoded.items()
+                        if raw.get(k) is not None and raw.get(k) == entry.raw.get(k)
+                    }
+                    entry.raw = {name: None for name in entry.raw}
+                    entry.raw.update(raw)
+                    entry.complete = True
+                wanted = list(entry.raw)
+            else:
+                wanted = list(dict.fromkeys(fields))
+                missing = (
+                    [] if entry.complete else [f for f in wanted if f not in entry.raw]
+                )
+                if missing:
+                    client = self._get_client()
+                    if not client:
+                        return {}
+                    values = await client.hmget(key, missing)
+                    entry.raw.update(zip(missing, values))
+
+            present = [f for f in wanted if entry.raw.get(f) is not None]
+            return LazyContext(entry.raw, entry.decoded, present)
+        except Exception as exc:
+            logger.warning("Octopus: context read failed for company %s: %s", company_id, exc)
+            self._cache.pop(company_id, None)
+            self._client = self._shared_client
+            return {}
@@ -1,24 +1,73 @@
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from typing import ClassVar
 import json
+import time
 
+try:
+    import orjson
+    _has_orjson = True
+except ImportError:
+    _has_orjson = False
 
-@dataclass
+# Match json.dumps(default=str): stringify non-str keys, and leave dataclasses
+# and datetimes to ``default=str`` instead of orjson's native encoding.
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    if _has_orjson
+    else 0
+)
+
+
+@dataclass(slots=True)
 class OctopusEvent:
     type: str                    # "chat.completed", "lead.created", "content.posted"
     company_id: int
     bot_id: int | None = None
-    timestamp: str = ""
+    timestamp: str | int = ""    # ISO-8601 string, or epoch millis with EPOCH_MILLIS
     data: dict = field(default_factory=dict)
 
+    # Stamp new events with epoch millis instead of formatting an ISO string.
+    EPOCH_MILLIS: ClassVar[bool] = False
+
     def __post_init__(self):
         if not self.timestamp:
-            self.timestamp = datetime.now(timezone.utc).isoformat()
+            if self.EPOCH_MILLIS:
+                self.timestamp = time.time_ns() // 1_000_000
+            else:
+                self.timestamp = datetime.now(timezone.utc).isoformat()
 
-    def to_json(self) -> str:
-        return json.dumps(asdict(self), ensure_ascii=False, default=str)
+    def to_dict(self) -> dict:
+        """Shallow view of the event; ``data`` is shared, not copied."""
+        return {
+            "type": self.type,
+            "company_id": self.company_id,
+            "bot_id": self.bot_id,
+            "timestamp": self.timestamp,
+            "data": self.data,
+        }
 
     @classmethod
-    def from_json(cls, raw: str) -> "OctopusEvent":
-        d = json.loads(raw)
+    def from_dict(cls, d: dict) -> "OctopusEvent":
         return cls(**d)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, default=str)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "OctopusEvent":
+        return cls(**json.loads(raw))
+
+    def to_bytes(self) -> bytes:
+        """UTF-8 JSON, encoded with orjson when it is installed."""
+        if _has_orjson:
+            return orjson.dumps(self.to_dict(), default=str, option=_ORJSON_OPTIONS)
+        return self.to_json().encode()
+
+    @classmethod
+    def from_bytes(cls, raw: str | bytes) -> "OctopusEvent":
+        if _has_orjson:
+            return cls(**orjson.loads(raw))
+        return cls.from_json(raw)
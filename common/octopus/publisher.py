@@ -1,16 +1,76 @@
+import asyncio
 import logging
+import time
+from collections import deque
+
 import redis
+from redis import asyncio as aioredis
+
+from common.octopus.serializers import OctopusSerializer, default_serializer
 
 logger = logging.getLogger("octopus.publisher")
 
 
+class StreamOptions:
+    """
+    Layout and retention of Octopus event streams.
+
+    ``maxlen`` caps each stream; ``approximate=True`` trims with ``~`` so Redis
+    only drops whole macro nodes instead of trimming on every XADD.
+    ``retention_ms`` switches to time-based trimming (MINID) and replaces
+    ``maxlen``. With ``shards > 1`` a company's events are spread over
+    ``octopus:events:{company_id}:{bot_id % shards}``.
+    """
+
+    def __init__(
+        self,
+        maxlen: int | None = 500,
+        approximate: bool = False,
+        retention_ms: int | None = None,
+        shards: int = 1,
+    ):
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        self.maxlen = None if retention_ms is not None else maxlen
+        self.approximate = approximate
+        self.retention_ms = retention_ms
+        self.shards = shards
+
+    def stream_key(self, company_id: int, bot_id: int | None = None) -> str:
+        if self.shards == 1:
+            return f"octopus:events:{company_id}"
+        return f"octopus:events:{company_id}:{(bot_id or 0) % self.shards}"
+
+    def stream_keys(self, company_id: int) -> list:
+        if self.shards == 1:
+            return [self.stream_key(company_id)]
+        return [f"octopus:events:{company_id}:{shard}" for shard in range(self.shards)]
+
+    def xadd_kwargs(self) -> dict:
+        if self.retention_ms is not None:
+            minid = int(time.time() * 1000) - self.retention_ms
+            return {"minid": minid, "approximate": self.approximate}
+        return {"maxlen": self.maxlen, "approximate": self.approximate}
+
+
 class OctopusPublisher:
     """Fire-and-forget event publisher. NEVER raises exceptions to callers."""
 
-    def __init__(self, redis_url: str = "", redis_db: int = 1):
+    def __init__(
+        self,
+        redis_url: str = "",
+        redis_db: int = 1,
+        client: redis.Redis | None = None,
+        options: StreamOptions | None = None,
+        serializer: OctopusSerializer | None = None,
+    ):
+        """``client`` is a shared decode_responses=True client, e.g. from RedisPoolRegistry."""
         self._redis_url = redis_url
         self._redis_db = redis_db
-        self._client = None
+        self._shared_client = client
+        self._client = client
+        self._options = options or StreamOptions()
+        self._serializer = serializer or default_serializer()
 
     def _get_client(self):
         if self._client is None:
@@ -30,10 +90,151 @@ class OctopusPublisher:
             client = self._get_client()
             if not client:
                 return False
-            stream_key = f"octopus:events:{event.company_id}"
-            client.xadd(stream_key, {"event": event.to_json()}, maxlen=500)
+            stream_key = self._options.stream_key(event.company_id, event.bot_id)
+            client.xadd(
+                stream_key, {"event": self._serializer.dumps(event)}, **self._options.xadd_kwargs()
+            )
             return True
         except Exception as exc:
             logger.warning("Octopus: emit failed for %s: %s", event.type, exc)
-            self._client = None  # Reset on failure
+            self._client = self._shared_client  # Reset on failure
+            return False
+
+
+class AsyncOctopusPublisher:
+    """
+    Async fire-and-forget publisher. ``emit`` only appends to a bounded
+    in-memory buffer; a background task flushes it in pipelined XADD batches
+    when ``batch_size`` events are waiting or every ``flush_interval`` seconds.
+    NEVER raises exceptions to callers.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = "",
+        redis_db: int = 1,
+        client: aioredis.Redis | None = None,
+        options: StreamOptions | None = None,
+        serializer: OctopusSerializer | None = None,
+        *,
+        max_buffer: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+    ):
+        self._redis_url = redis_url
+        self._redis_db = redis_db
+        self._shared_client = client
+        self._client = client
+        self._options = options or StreamOptions()
+        self._serializer = serializer or default_serializer()
+        self._max_buffer = max_buffer
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._buffer: deque = deque()
+        self._wakeup: asyncio.Event | None = None
+        self._flusher: asyncio.Task | None = None
+        self._stopping = False
+        self.emitted = 0
+        self.flushed = 0
+        self.dropped = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "emitted": self.emitted,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "buffered": len(self._buffer),
+        }
+
+    def _get_client(self):
+        if self._client is None:
+            try:
+                self._client = aioredis.Redis.from_url(
+                    self._redis_url, db=self._redis_db, decode_responses=True,
+                    socket_connect_timeout=2, socket_timeout=2,
+                )
+            except Exception as exc:
+                logger.warning("Octopus: Redis connection failed: %s", exc)
+                return None
+        return self._client
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._ensure_flusher()
+
+    async def stop(self) -> None:
+        """Flush what is buffered and stop the background task."""
+        self._stopping = True
+        if self._flusher is not None:
+            self._wakeup.set()
+            try:
+                await self._flusher
+            except Exception:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None and not self._flusher.done():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wakeup = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    def emit(self, event) -> bool:
+        """Buffer event for publishing. Returns False if it was dropped."""
+        try:
+            if len(self._buffer) >= self._max_buffer:
+                self.dropped += 1
+                return False
+            self._buffer.append(
+                (
+                    self._options.stream_key(event.company_id, event.bot_id),
+                    self._serializer.dumps(event),
+                )
+            )
+            self.emitted += 1
+            if not self._stopping:
+                self._ensure_flusher()
+            if self._wakeup is not None and len(self._buffer) >= self._batch_size:
+                self._wakeup.set()
+            return True
+        except Exception as exc:
+            logger.warning("Octopus: emit failed for %s: %s", getattr(event, "type", None), exc)
+            self.dropped += 1
             return False
+
+    async def _flush_loop(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Send everything currently buffered, ``batch_size`` events per round trip."""
+        while self._buffer:
+            batch = [
+                self._buffer.popleft()
+                for _ in range(min(self._batch_size, len(self._buffer)))
+            ]
+            try:
+                client = self._get_client()
+                if not client:
+                    raise ConnectionError("no redis client")
+                xadd_kwargs = self._options.xadd_kwargs()
+                async with client.pipeline(transaction=False) as pipe:
+                    for stream_key, payload in batch:
+                        pipe.xadd(stream_key, {"event": payload}, **xadd_kwargs)
+                    await pipe.execute()
+                self.flushed += len(batch)
+            except Exception as exc:
+                logger.warning("Octopus: flush of %d events failed: %s", len(batch), exc)
+                self.dropped += len(batch)
+                self._client = self._shared_client  # Reset on failure
@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+
+from common.octopus.event import OctopusEvent, _has_orjson
+
+try:
+    import msgpack
+    _has_msgpack = True
+except ImportError:
+    _has_msgpack = False
+
+
+class OctopusSerializer(ABC):
+    """Encodes events for the stream ``event`` field and decodes them back."""
+
+    @abstractmethod
+    def dumps(self, event: OctopusEvent) -> str | bytes: ...
+
+    @abstractmethod
+    def loads(self, raw: str | bytes) -> OctopusEvent: ...
+
+
+class JsonOctopusSerializer(OctopusSerializer):
+    def dumps(self, event: OctopusEvent) -> str | bytes:
+        return event.to_json()
+
+    def loads(self, raw: str | bytes) -> OctopusEvent:
+        return OctopusEvent.from_json(raw)
+
+
+class OrjsonOctopusSerializer(OctopusSerializer):
+    """Same JSON on the wire as JsonOctopusSerializer, produced by orjson."""
+
+    def __init__(self) -> None:
+        if not _has_orjson:
+            raise RuntimeError("orjson is not installed")
+
+    def dumps(self, event: OctopusEvent) -> str | bytes:
+        return event.to_bytes()
+
+    def loads(self, raw: str | bytes) -> OctopusEvent:
+        return OctopusEvent.from_bytes(raw)
+
+
+class MsgpackOctopusSerializer(OctopusSerializer):
+    """
+    Binary msgpack encoding. Not readable by JSON consumers, and the reading
+    client must not use ``decode_responses=True``.
+    """
+
+    def __init__(self) -> None:
+        if not _has_msgpack:
+            raise RuntimeError("msgpack is not installed")
+
+    def dumps(self, event: OctopusEvent) -> str | bytes:
+        return msgpack.packb(event.to_dict(), default=str, use_bin_type=True)
+
+    def loads(self, raw: str | bytes) -> OctopusEvent:
+        return OctopusEvent.from_dict(msgpack.unpackb(raw, raw=False))
+
+
+def default_serializer() -> OctopusSerializer:
+    return OrjsonOctopusSerializer() if _has_orjson else JsonOctopusSerializer()
@@ -0,0 +1,19 @@
+from .serializers import CacheSerializer, JsonCacheSerializer, PickleCacheSerializer
+from .interface import RedisCache
+from .near import (
+    CacheEventType,
+    CacheInvalidationPayload,
+    LocalCache,
+    NearCache,
+)
+
+__all__ = [
+    "CacheSerializer",
+    "JsonCacheSerializer",
+    "PickleCacheSerializer",
+    "RedisCache",
+    "CacheEventType",
+    "CacheInvalidationPayload",
+    "LocalCache",
+    "NearCache",
+]
@@ -0,0 +1,293 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import math
+import random
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple, TypeVar
+
+from redis.asyncio import Redis
+
+from common.redis.cache.serializers import CacheSerializer, JsonCacheSerializer
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+# Reserved key marking an early-refresh entry: ``{_ENVELOPE_KEY: delta,
+# "value": value}``. Plain values never carry it, so they are not unwrapped.
+_ENVELOPE_KEY = "__cache_refresh_delta__"
+
+
+def _unwrap_envelope(entry: Any) -> Tuple[Any, Optional[float]]:
+    """Split a stored entry into its value and compute time (None if plain)."""
+    if (
+        isinstance(entry, dict)
+        and len(entry) == 2
+        and _ENVELOPE_KEY in entry
+        and "value" in entry
+    ):
+        return entry["value"], entry[_ENVELOPE_KEY]
+    return entry, None
+
+# Delete the lock only if we still own it.
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisCache:
+    """
+    Async cache on top of a shared ``redis.asyncio.Redis`` client.
+
+    Keys are namespaced as ``{namespace}:{key}``. ``ttl=None`` on a write
+    falls back to ``default_ttl``; a ``default_ttl`` of None stores keys
+    without expiry.
+
+    The default ``JsonCacheSerializer`` only stores plain JSON values; a
+    ``cached`` function returning pydantic models or dataclasses is not cached
+    (the write fails with a logged ``TypeError``) unless it returns
+    ``model_dump(mode="json")`` or the cache uses ``PickleCacheSerializer``.
+
+    Recomputation through ``get_or_set``/``cached`` is coalesced: concurrent
+    callers in one process share a single computation, ``lock_timeout``
+    extends that across processes with a Redis lock, and
+    ``early_refresh_beta`` recomputes a hot key shortly before it expires
+    (probabilistic early expiration) so expiry does not hit every caller at
+    once.
+    """
+
+    LOCK_POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        namespace: str = "cache",
+        default_ttl: Optional[int] = 300,
+        serializer: Optional[CacheSerializer] = None,
+    ) -> None:
+        self._redis = redis
+        self._namespace = namespace
+        self._default_ttl = default_ttl
+        self._serializer = serializer or JsonCacheSerializer()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def make_key(self, key: str) -> str:
+        return f"{self._namespace}:{key}"
+
+    def _ttl(self, ttl: Optional[int]) -> Optional[int]:
+        return self._default_ttl if ttl is None else ttl
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        raw = await self._redis.get(self.make_key(key))
+        if raw is None:
+            return default
+        return _unwrap_envelope(self._serializer.loads(raw))[0]
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        await self._redis.set(
+            self.make_key(key), self._serializer.dumps(value), ex=self._ttl(ttl)
+        )
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        return await self._redis.delete(*(self.make_key(k) for k in keys))
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Fetch several keys in one round trip; missing keys are omitted."""
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        raw_values = await self._redis.mget([self.make_key(k) for k in keys])
+        return {
+            key: _unwrap_envelope(self._serializer.loads(raw))[0]
+            for key, raw in zip(keys, raw_values)
+            if raw is not None
+        }
+
+    async def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Store several keys with the same TTL in one pipelined round trip."""
+        if not mapping:
+            return
+
+        ex = self._ttl(ttl)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(self.make_key(key), self._serializer.dumps(value), ex=ex)
+            await pipe.execute()
+
+    async def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[T]],
+        ttl: Optional[int] = None,
+        *,
+        lock_timeout: Optional[float] = None,
+        early_refresh_beta: Optional[float] = None,
+    ) -> T:
+        """
+        Return the cached value for ``key`` or compute it with ``factory``.
+
+        A miss triggers at most one ``factory`` call per process; with
+        ``lock_timeout`` (seconds) at most one per cluster, other processes
+        polling the cache until the lock holder stores the value. With
+        ``early_refresh_beta`` (1.0 is a sensible default) values are stored
+        together with their compute time and refreshed early with a
+        probability that grows as expiry approaches; ``get``/``get_many``
+        return the bare value.
+        """
+        try:
+            value = await self._read(key, early_refresh_beta)
+        except Exception as e:
+            logger.warning("Cache read failed for %s: %s", key, e)
+            return await factory()
+
+        if value is not _MISSING:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._recompute(key, factory, ttl, lock_timeout, early_refresh_beta)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _read(self, key: str, early_refresh_beta: Optional[float]) -> Any:
+        if early_refresh_beta is None:
+            return await self.get(key, _MISSING)
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.get(self.make_key(key))
+            pipe.pttl(self.make_key(key))
+            raw, pttl = await pipe.execute()
+
+        if raw is None:
+            return _MISSING
+
+        value, delta = _unwrap_envelope(self._serializer.loads(raw))
+        if delta is not None and pttl > 0:
+            remaining = pttl / 1000
+            rand = random.random() or 1e-12
+            gap = -delta * early_refresh_beta * math.log(rand)
+            if gap >= remaining:
+                return _MISSING
+        return value
+
+    async def _recompute(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[T]],
+        ttl: Optional[int],
+        lock_timeout: Optional[float],
+        early_refresh_beta: Optional[float],
+    ) -> T:
+        lock_key = self.make_key(f"lock:{key}")
+        token = uuid.uuid4().hex
+        acquired = False
+
+        if lock_timeout is not None:
+            try:
+                acquired = bool(
+                    await self._redis.set(
+                        lock_key, token, nx=True, px=int(lock_timeout * 1000)
+                    )
+                )
+                if not acquired:
+                    value = await self._wait_for_value(key, lock_timeout)
+                    if value is not _MISSING:
+                        return value
+            except Exception as e:
+                logger.warning("Cache lock failed for %s: %s", key, e)
+
+        try:
+            started = time.monotonic()
+            value = await factory()
+            delta = time.monotonic() - started
+
+            stored = value
+            if early_refresh_beta is not None:
+                stored = {_ENVELOPE_KEY: delta, "value": value}
+            try:
+                await self.set(key, stored, ttl)
+            except Exception as e:
+                logger.warning("Cache write failed for %s: %s", key, e)
+            return value
+        finally:
+            if acquired:
+                try:
+                    await self._redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    logger.warning("Cache unlock failed for %s: %s", key, e)
+
+    async def _wait_for_value(self, key: str, timeout: float) -> Any:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.LOCK_POLL_INTERVAL)
+            value = await self._read(key, None)
+            if value is not _MISSING:
+                return value
+        return _MISSING
+
+    def cached(
+        self,
+        ttl: Optional[int] = None,
+        *,
+        key_prefix: Optional[str] = None,
+        key_builder: Optional[Callable[..., str]] = None,
+        lock_timeout: Optional[float] = None,
+        early_refresh_beta: Optional[float] = None,
+    ) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+        """
+        Cache the result of an async function, keyed by its arguments.
+
+        The default key is ``{key_prefix or module.qualname}:{sha1 of bound
+        arguments}``, skipping a leading ``self``/``cls``. Pass ``key_builder``
+        (called with the same arguments) when reprs are not stable. Redis
+        errors are logged and the function is called directly. See
+        ``get_or_set`` for ``lock_timeout`` and ``early_refresh_beta``.
+        """
+
+        def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+            prefix = key_prefix or f"{func.__module__}.{func.__qualname__}"
+            signature = inspect.signature(func)
+
+            def build_key(args, kwargs) -> str:
+                if key_builder is not None:
+                    return f"{prefix}:{key_builder(*args, **kwargs)}"
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = [
+                    (name, value)
+                    for name, value in bound.arguments.items()
+                    if name not in ("self", "cls")
+                ]
+                digest = hashlib.sha1(repr(arguments).encode("utf-8")).hexdigest()
+                return f"{prefix}:{digest}"
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs) -> T:
+                return await self.get_or_set(
+                    build_key(args, kwargs),
+                    lambda: func(*args, **kwargs),
+                    ttl,
+                    lock_timeout=lock_timeout,
+                    early_refresh_beta=early_refresh_beta,
+                )
+
+            wrapper.cache_key = lambda *args, **kwargs: build_key(args, kwargs)
+            return wrapper
+
+        return decorator
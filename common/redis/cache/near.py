@@ -0,0 +1,248 @@
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from common.redis.cache.interface import RedisCache, _MISSING, _unwrap_envelope
+from common.redis.cache.serializers import CacheSerializer
+from common.redis.pubsub import (
+    BaseEventType,
+    EventPayload,
+    EventPublisher,
+    EventSubscriber,
+)
+
+
+class CacheEventType(BaseEventType):
+    invalidate = "cache_invalidate"
+
+
+class CacheInvalidationPayload(EventPayload):
+    event: CacheEventType
+
+
+class LocalCache:
+    """Bounded in-process LRU with a per-entry TTL (monotonic clock)."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str, default: Any = _MISSING) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class _InvalidationSubscriber(EventSubscriber):
+    """
+    Subscriber for the in-process invalidation listener: there is no socket to
+    heartbeat, and a dropped invalidation would leave a stale local entry.
+    """
+
+    PING_INTERVAL = None
+    SEND_QUEUE_SIZE = 0
+
+
+class _InvalidationListener:
+    """ConnectionLike adapter that drops local entries named in invalidation events."""
+
+    def __init__(self, near_cache: "NearCache") -> None:
+        self._near_cache = near_cache
+
+    async def send_text(self, data: str) -> None:
+        self._near_cache._on_invalidation(data)
+
+    async def receive_text(self) -> str:
+        return "pong"
+
+    async def close(self, *, code: int, reason: str | None = None) -> None:
+        pass
+
+    async def accept(self) -> None:
+        pass
+
+
+class NearCache(RedisCache):
+    """
+    Two-tier cache: a bounded in-process LRU/TTL tier in front of Redis.
+
+    Writes and deletes are broadcast on ``{namespace}:invalidate`` with
+    EventPublisher; every worker runs a small EventSubscriber on that channel
+    and drops the named keys from its local tier. ``local_ttl`` bounds how
+    long a worker can serve a stale value if an invalidation is missed.
+
+    Values in the local tier are shared objects; callers must not mutate them.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        logger: logging.Logger,
+        namespace: str = "cache",
+        default_ttl: Optional[int] = 300,
+        serializer: Optional[CacheSerializer] = None,
+        maxsize: int = 1024,
+        local_ttl: float = 30,
+    ) -> None:
+        super().__init__(
+            redis, namespace=namespace, default_ttl=default_ttl, serializer=serializer
+        )
+        self._logger = logger
+        self._local = LocalCache(maxsize=maxsize, ttl=local_ttl)
+        self._node_id = uuid.uuid4().hex
+        self._channel = f"{namespace}:invalidate"
+        self._publisher = EventPublisher(redis)
+        self._subscriber = _InvalidationSubscriber(
+            redis,
+            logger=logger,
+            events_cls=CacheEventType,
+            events_payload_cls=CacheInvalidationPayload,
+            targeted_subscriptions=True,
+            lazy_validation=True,
+        )
+        self._listener = _InvalidationListener(self)
+
+    async def start(self) -> None:
+        await self._subscriber.start()
+        await self._subscriber.subscribe_user(
+            f"near-cache:{self._node_id}", self._listener, channels=[self._channel]
+        )
+
+    async def stop(self) -> None:
+        await self._subscriber.stop()
+        self._local.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self._local.hits,
+            "misses": self._local.misses,
+            "evictions": self._local.evictions,
+            "expirations": self._local.expirations,
+            "size": len(self._local),
+        }
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        value = self._local.get(key)
+        if value is not _MISSING:
+            return value
+
+        value = await super().get(key, _MISSING)
+        if value is _MISSING:
+            return default
+
+        self._local.set(key, value)
+        return value
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        remote_keys = []
+        for key in keys:
+            value = self._local.get(key)
+            if value is _MISSING:
+                remote_keys.append(key)
+            else:
+                result[key] = value
+
+        if remote_keys:
+            fetched = await super().get_many(remote_keys)
+            for key, value in fetched.items():
+                self._local.set(key, value)
+            result.update(fetched)
+        return result
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        await super().set(key, value, ttl)
+        self._local.set(key, _unwrap_envelope(value)[0])
+        await self._broadcast([key])
+
+    async def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        await super().set_many(mapping, ttl)
+        for key, value in mapping.items():
+            self._local.set(key, value)
+        await self._broadcast(list(mapping))
+
+    async def delete(self, *keys: str) -> int:
+        deleted = await super().delete(*keys)
+        await self.invalidate(*keys)
+        return deleted
+
+    async def invalidate(self, *keys: str) -> None:
+        """Drop keys from the local tier of every worker without touching Redis."""
+        self._local.discard(keys)
+        await self._broadcast(list(keys))
+
+    async def _broadcast(self, keys: list) -> None:
+        if not keys:
+            return
+
+        payload = CacheInvalidationPayload(
+            event=CacheEventType.invalidate,
+            data={"origin": self._node_id, "keys": keys},
+        )
+        try:
+            await self._publisher.publish_payload(channel=self._channel, payload=payload)
+        except Exception as e:
+            self._logger.warning(f"Cache invalidation broadcast failed: {e}")
+
+    def _on_invalidation(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError as e:
+            self._logger.warning(f"Malformed cache invalidation: {e}")
+            return
+
+        if (
+            not isinstance(message, dict)
+            or message.get("event") != CacheEventType.invalidate.value
+        ):
+            return
+
+        data = message.get("data")
+        if not isinstance(data, dict):
+            self._logger.warning("Malformed cache invalidation: no data")
+            return
+
+        if data.get("origin") == self._node_id:
+            return
+        self._local.discard(data.get("keys") or ())
@@ -0,0 +1,57 @@
+import json
+import pickle
+from abc import ABC, abstractmethod
+from typing import Any
+
+try:
+    import orjson
+    _has_orjson = True
+except ImportError:
+    _has_orjson = False
+
+
+class CacheSerializer(ABC):
+    """Converts cached values to and from the bytes stored in Redis."""
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes: ...
+
+    @abstractmethod
+    def loads(self, raw: bytes) -> Any: ...
+
+
+class JsonCacheSerializer(CacheSerializer):
+    """
+    Plain JSON values only (dicts, lists, str, numbers, bool, None); anything
+    else raises ``TypeError`` on write. Cache pydantic models as
+    ``model_dump(mode="json")`` or use ``PickleCacheSerializer``.
+    """
+
+    # orjson would otherwise encode these natively where stdlib json refuses.
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        if _has_orjson
+        else 0
+    )
+
+    def dumps(self, value: Any) -> bytes:
+        if _has_orjson:
+            return orjson.dumps(value, option=self._ORJSON_OPTIONS)
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, raw: bytes) -> Any:
+        if _has_orjson:
+            return orjson.loads(raw)
+        return json.loads(raw)
+
+
+class PickleCacheSerializer(CacheSerializer):
+    """Round-trips arbitrary Python objects (pydantic models, dataclasses, ...)."""
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, raw: bytes) -> Any:
+        return pickle.loads(raw)
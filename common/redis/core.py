@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from typing import Dict, Optional
 
 from fastapi import FastAPI
 from redis import asyncio as redis
@@ -7,17 +9,87 @@ from redis import asyncio as redis
 def create_redis_pool(
     connection_url,
     logger: logging.Logger,
+    *,
+    max_connections: Optional[int] = None,
+    blocking: bool = False,
+    pool_timeout: Optional[float] = 20,
+    health_check_interval: int = 0,
+    socket_keepalive: bool = False,
+    socket_timeout: Optional[float] = None,
+    socket_connect_timeout: Optional[float] = None,
+    **connection_kwargs,
 ) -> redis.Redis:  # TODO - rename
+    """
+    Create a Redis client backed by a tunable connection pool.
+
+    ``max_connections`` caps the pool; with ``blocking=True`` callers wait up to
+    ``pool_timeout`` seconds for a free connection instead of getting
+    "Too many connections", and an unset ``max_connections`` keeps
+    BlockingConnectionPool's default of 50. ``health_check_interval`` pings connections idle
+    for longer than that many seconds before reuse.
+    """
     try:
-        pool = redis.ConnectionPool.from_url(connection_url)
+        pool_kwargs = dict(
+            health_check_interval=health_check_interval,
+            socket_keepalive=socket_keepalive,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_connect_timeout,
+            **connection_kwargs,
+        )
+        # None would mean "unbounded" and disable the blocking wait entirely.
+        if max_connections is not None:
+            pool_kwargs["max_connections"] = max_connections
+        if blocking:
+            pool = redis.BlockingConnectionPool.from_url(
+                connection_url, timeout=pool_timeout, **pool_kwargs
+            )
+        else:
+            pool = redis.ConnectionPool.from_url(connection_url, **pool_kwargs)
         return redis.Redis(connection_pool=pool)
     except Exception as e:
         logger.warning(f"An error occurred when trying to create a new pool: {e}")
         raise
 
 
-def get_redis_pool(app: FastAPI) -> redis.Redis:
-    pool = getattr(app.state, "redis_websocket_pool", None)
+async def warm_redis_pool(client: redis.Redis, connections: int) -> int:
+    """Open up to ``connections`` pooled connections ahead of traffic."""
+    pool = client.connection_pool
+    connections = min(connections, pool.max_connections)
+    acquired = await asyncio.gather(
+        *(pool.get_connection() for _ in range(connections)), return_exceptions=True
+    )
+
+    opened = 0
+    for conn in acquired:
+        if isinstance(conn, BaseException):
+            continue
+        opened += 1
+        await pool.release(conn)
+    return opened
+
+
+def get_redis_pool_stats(client: redis.Redis) -> Dict[str, int]:
+    pool = client.connection_pool
+    in_use = len(pool._in_use_connections)
+    available = len(pool._available_connections)
+    return {
+        "max_connections": pool.max_connections,
+        "created": in_use + available,
+        "in_use": in_use,
+        "available": available,
+    }
+
+
+def get_redis_pool(app: FastAPI, name: Optional[str] = None) -> redis.Redis:
+    if name is not None:
+        registry = getattr(app.state, "redis_pools", None)
+        if registry is None:
+            raise RuntimeError("Redis pool registry does not found in app.state")
+        return registry.get(name)
+
+    pool = getattr(app.state, "redis_pool", None) or getattr(
+        app.state, "redis_websocket_pool", None
+    )
 
     if pool is None:
         raise RuntimeError("Redis Pool does not found in app.state")
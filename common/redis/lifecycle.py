@@ -1,19 +1,62 @@
 import logging
+from typing import Any, Dict, Optional
 
 from fastapi import FastAPI
 
-from common.redis.core import create_redis_pool
+from common.redis.registry import RedisPoolRegistry
 
+DEFAULT_POOL = "default"
 
-async def on_redis_startup(app: FastAPI, connection_url, logger: logging.Logger):
-    redis_pool = create_redis_pool(connection_url=connection_url, logger=logger)
 
+async def on_redis_startup(
+    app: FastAPI,
+    connection_url,
+    logger: logging.Logger,
+    warm_connections: int = 0,
+    pools: Optional[Dict[str, Dict[str, Any]]] = None,
+    **pool_kwargs,
+):
+    """
+    Create the process' Redis pools once and store them in ``app.state``.
+
+    The default pool is built from ``connection_url``/``pool_kwargs``. Extra
+    named pools come from ``pools``, e.g.
+    ``{"cache": {"max_connections": 20}, "octopus": {"connection_url": url,
+    "db": 1, "sync": True, "decode_responses": True}}``; a missing
+    ``connection_url`` reuses the default one and ``sync=True`` creates a
+    blocking client (as the Octopus helpers expect).
+    """
+    registry = RedisPoolRegistry(logger)
+    redis_pool = registry.create(DEFAULT_POOL, connection_url, **pool_kwargs)
+
+    for name, options in (pools or {}).items():
+        options = dict(options)
+        url = options.pop("connection_url", connection_url)
+        if options.pop("sync", False):
+            registry.create_sync(name, url, **options)
+        else:
+            registry.create(name, url, **options)
+
+    if warm_connections:
+        opened = await registry.warm(warm_connections)
+        logger.info(f"Redis pools warmed: {opened}")
+
+    app.state.redis_pools = registry
     app.state.redis_pool = redis_pool
+    # Legacy key, still read by older services.
+    app.state.redis_websocket_pool = redis_pool
 
-    logger.info(f"Redis pool created successfully.")
+    logger.info(f"Redis pools created successfully: {registry.names}")
 
 
 async def on_redis_shutdown(app: FastAPI, logger: logging.Logger):
+    registry: RedisPoolRegistry | None = getattr(app.state, "redis_pools", None)
+    if registry:
+        logger.info("Clothing Redis pools...")
+        await registry.close()
+        logger.info("Redis pools are closed.")
+        return
+
     pool_to_close = getattr(app.state, "redis_pool", None)
 
     if pool_to_close:
@@ -1,4 +1,17 @@
-from .core import BaseEventType, EventPayload, ConnectionLike, _EventRegistry
+from .core import (
+    BaseEventType,
+    EventPayload,
+    ConnectionLike,
+    OverflowPolicy,
+    _EventRegistry,
+)
+from .serializers import (
+    EventSerializer,
+    JsonEventSerializer,
+    OrjsonEventSerializer,
+    default_serializer,
+)
+from .registry import SessionRegistry
 from .subcriber.interface import EventSubscriber
 from .publisher.interface import EventPublisher
 
@@ -6,7 +19,13 @@ __all__ = [
     "ConnectionLike",
     "BaseEventType",
     "EventPayload",
+    "OverflowPolicy",
     "_EventRegistry",
+    "EventSerializer",
+    "JsonEventSerializer",
+    "OrjsonEventSerializer",
+    "default_serializer",
+    "SessionRegistry",
     "EventPublisher",
     "EventSubscriber",
 ]
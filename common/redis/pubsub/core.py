@@ -9,6 +9,14 @@ class BaseEventType(str, Enum):
     pass
 
 
+class OverflowPolicy(str, Enum):
+    """What to do when a connection's outbound queue is full."""
+
+    drop_oldest = "drop_oldest"
+    drop_newest = "drop_newest"
+    disconnect = "disconnect"
+
+
 class EventPayload(BaseModel):
     destination: str = "ws_event"
     event: BaseEventType
@@ -31,6 +39,9 @@ class _EventRegistry(ABC):
     ) -> None:
         self._events_cls = events_cls
         self._events_payload_cls = events_payload_cls
+        self._event_values = (
+            frozenset(ev.value for ev in events_cls) if events_cls is not None else None
+        )
 
     def _is_registered(self, ev: BaseEventType) -> bool:
         return self._events_cls is None or isinstance(ev, self._events_cls)
@@ -1,6 +1,8 @@
 import logging
+from typing import Optional
 from fastapi import FastAPI
 from redis.asyncio import Redis
+from common.redis.core import get_redis_pool
 from common.redis.pubsub import EventSubscriber, BaseEventType, EventPayload
 
 
@@ -10,13 +12,18 @@ async def on_pubsub_startup(
     events_cls: BaseEventType,
     events_payload_cls: EventPayload,
     logger: logging.Logger,
+    targeted_subscriptions: bool = False,
+    lazy_validation: bool = False,
+    pool_name: Optional[str] = None,
 ):
-    redis = getattr(app.state, "redis_pool", None)
+    redis = get_redis_pool(app, pool_name)
     events_subscriber: EventSubscriber = events_subscriber(
         redis,
         logger=logger,
         events_cls=events_cls,
         events_payload_cls=events_payload_cls,
+        targeted_subscriptions=targeted_subscriptions,
+        lazy_validation=lazy_validation,
     )
     await events_subscriber.start()
     app.state.events_subscriber = events_subscriber
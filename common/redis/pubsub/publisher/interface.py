@@ -1,14 +1,42 @@
-from typing import Any
+import asyncio
+from typing import Any, Iterable, List, Optional, Tuple
 
 from redis.asyncio import Redis
 
-from common.redis.pubsub import BaseEventType, EventPayload
+from common.redis.pubsub import (
+    BaseEventType,
+    EventPayload,
+    EventSerializer,
+    default_serializer,
+    SessionRegistry,
+)
 
 
 class EventPublisher:
 
-    def __init__(self, redis: Redis) -> None:
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        batch_window: Optional[float] = None,
+        batch_max_size: int = 500,
+        serializer: Optional[EventSerializer] = None,
+        registry: Optional[SessionRegistry] = None,
+    ) -> None:
+        """
+        With ``batch_window`` set (in seconds), ``publish``/``publish_payload``
+        calls made within the window are coalesced and sent in one pipelined
+        round trip; a batch is flushed early once it reaches ``batch_max_size``.
+
+        ``registry`` enables ``publish_to_session``.
+        """
         self._redis = redis
+        self._serializer = serializer or default_serializer()
+        self._registry = registry
+        self._batch_window = batch_window
+        self._batch_max_size = batch_max_size
+        self._pending: List[Tuple[str, str | bytes, asyncio.Future]] = []
+        self._flush_task: asyncio.Task[None] | None = None
 
     async def publish(
         self,
@@ -18,9 +46,109 @@ class EventPublisher:
         data: Any,
         **kwargs,
     ) -> None:
-        payload = event_cls(event=event, data=data, **kwargs).model_dump_json()
-        await self._redis.publish(channel, payload)
+        payload = self._serializer.dumps(event_cls(event=event, data=data, **kwargs))
+        await self._publish_raw(channel, payload)
 
     async def publish_payload(self, *, channel: str, payload: EventPayload) -> None:
-        payload = payload.model_dump_json()
-        await self._redis.publish(channel, payload)
+        await self._publish_raw(channel, self._serializer.dumps(payload))
+
+    async def publish_many(self, messages: Iterable[Tuple[str, EventPayload]]) -> None:
+        """Publish ``(channel, payload)`` pairs in a single pipelined round trip."""
+        await self._execute(
+            [(channel, self._serializer.dumps(payload)) for channel, payload in messages]
+        )
+
+    async def publish_to_channels(
+        self, channels: Iterable[str], payload: EventPayload
+    ) -> None:
+        """Broadcast one payload to many channels, serializing it only once."""
+        raw = self._serializer.dumps(payload)
+        if isinstance(raw, str):
+            raw = raw.encode()
+        await self._execute([(channel, raw) for channel in channels])
+
+    async def publish_to_session(self, session_id: str, payload: EventPayload) -> int:
+        """
+        Deliver ``payload`` to every connection of ``session_id``, publishing
+        only to the nodes that hold it. Returns the number of nodes targeted.
+        """
+        if self._registry is None:
+            raise RuntimeError("publish_to_session requires a SessionRegistry")
+
+        node_ids = await self._registry.nodes(session_id)
+        if not node_ids:
+            return 0
+
+        raw = self._serializer.dumps(payload)
+        await self._execute(
+            [(self._registry.node_channel(n, session_id), raw) for n in node_ids]
+        )
+        return len(node_ids)
+
+    async def flush(self) -> None:
+        """Send any micro-batched messages immediately."""
+        await self._flush(self._take_pending())
+
+    async def _publish_raw(self, channel: str, payload: str | bytes) -> None:
+        if self._batch_window is None:
+            await self._redis.publish(channel, payload)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((channel, payload, future))
+
+        if len(self._pending) >= self._batch_max_size:
+            await self._flush(self._take_pending())
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+        await future
+
+    async def _flush_after_window(self) -> None:
+        try:
+            await asyncio.sleep(self._batch_window)
+        except asyncio.CancelledError:
+            self._flush_task = None
+            self._cancel(self._take_pending())
+            raise
+        self._flush_task = None
+        await self._flush(self._take_pending())
+
+    def _take_pending(self) -> List[Tuple[str, str | bytes, asyncio.Future]]:
+        pending, self._pending = self._pending, []
+        return pending
+
+    async def _flush(self, pending: List[Tuple[str, str | bytes, asyncio.Future]]) -> None:
+        if not pending:
+            return
+
+        try:
+            await self._execute([(channel, payload) for channel, payload, _ in pending])
+        except Exception as e:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # Cancelled mid-flush: do not leave the other callers waiting forever.
+            self._cancel(pending)
+            raise
+
+        for _, _, future in pending:
+            if not future.done():
+                future.set_result(None)
+
+    @staticmethod
+    def _cancel(pending: List[Tuple[str, str | bytes, asyncio.Future]]) -> None:
+        for _, _, future in pending:
+            if not future.done():
+                future.cancel()
+
+    async def _execute(self, messages: List[Tuple[str, str | bytes]]) -> None:
+        if not messages:
+            return
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for channel, payload in messages:
+                pipe.publish(channel, payload)
+            await pipe.execute()
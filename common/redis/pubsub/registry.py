@@ -0,0 +1,113 @@
+import os
+import socket
+import uuid
+from typing import Dict, Iterable, Optional
+
+from redis.asyncio import Redis
+
+
+class SessionRegistry:
+    """
+    Redis-backed map of websocket sessions to the nodes holding them.
+
+    Every node keeps ``{prefix}:session:{session_id}`` hashes of
+    ``node_id -> connection count`` up to date and a ``{prefix}:alive:{node_id}``
+    heartbeat key, both with a TTL refreshed by ``refresh()``. Counts from nodes
+    whose heartbeat has expired are ignored, so a crashed worker stops being
+    routed to after at most ``ttl`` seconds.
+
+    Messages for a session are published to ``{prefix}:node:{node_id}:{session_id}``
+    on each node that holds it; the EventSubscriber of that node listens on its
+    own ``{prefix}:node:{node_id}:*`` pattern.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        node_id: Optional[str] = None,
+        ttl: int = 60,
+        prefix: str = "ws",
+    ) -> None:
+        self._redis = redis
+        self.node_id = (
+            node_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self.ttl = ttl
+        self._prefix = prefix
+
+    @property
+    def node_channel_prefix(self) -> str:
+        return f"{self._prefix}:node:{self.node_id}:"
+
+    @property
+    def node_pattern(self) -> str:
+        return f"{self.node_channel_prefix}*"
+
+    def node_channel(self, node_id: str, session_id: str) -> str:
+        return f"{self._prefix}:node:{node_id}:{session_id}"
+
+    def _session_key(self, session_id: str) -> str:
+        return f"{self._prefix}:session:{session_id}"
+
+    def _alive_key(self, node_id: str) -> str:
+        return f"{self._prefix}:alive:{node_id}"
+
+    async def add(self, session_id: str) -> None:
+        await self._change(session_id, 1)
+
+    async def remove(self, session_id: str) -> None:
+        await self._change(session_id, -1)
+
+    async def _change(self, session_id: str, delta: int) -> None:
+        key = self._session_key(session_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._alive_key(self.node_id), 1, ex=self.ttl)
+            pipe.hincrby(key, self.node_id, delta)
+            pipe.expire(key, self.ttl)
+            _, count, _ = await pipe.execute()
+
+        if int(count) <= 0:
+            await self._redis.hdel(key, self.node_id)
+
+    async def nodes(self, session_id: str) -> Dict[str, int]:
+        """Return ``node_id -> connection count`` for live nodes holding the session."""
+        raw = await self._redis.hgetall(self._session_key(session_id))
+        if not raw:
+            return {}
+
+        counts = {
+            (k.decode() if isinstance(k, bytes) else k): int(v) for k, v in raw.items()
+        }
+        node_ids = [node_id for node_id, count in counts.items() if count > 0]
+        if not node_ids:
+            return {}
+
+        alive = await self._redis.mget([self._alive_key(n) for n in node_ids])
+        return {
+            node_id: counts[node_id]
+            for node_id, flag in zip(node_ids, alive)
+            if flag is not None
+        }
+
+    async def count(self, session_id: str) -> int:
+        """Total connections for the session across all live nodes."""
+        return sum((await self.nodes(session_id)).values())
+
+    async def refresh(self, local_counts: Dict[str, int]) -> None:
+        """Re-assert this node's heartbeat and session counts, extending their TTL."""
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._alive_key(self.node_id), 1, ex=self.ttl)
+            for session_id, count in local_counts.items():
+                key = self._session_key(session_id)
+                pipe.hset(key, self.node_id, count)
+                pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def clear(self, session_ids: Iterable[str]) -> None:
+        """Drop this node from the given sessions and stop its heartbeat."""
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.delete(self._alive_key(self.node_id))
+            for session_id in session_ids:
+                pipe.hdel(self._session_key(session_id), self.node_id)
+            await pipe.execute()
@@ -0,0 +1,47 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any
+
+from common.redis.pubsub.core import EventPayload
+
+try:
+    import orjson
+    _has_orjson = True
+except ImportError:
+    _has_orjson = False
+
+
+class EventSerializer(ABC):
+    """Encodes payloads for EventPublisher and decodes them in EventSubscriber."""
+
+    @abstractmethod
+    def dumps(self, payload: EventPayload) -> str | bytes: ...
+
+    @abstractmethod
+    def loads(self, raw: str | bytes) -> Any: ...
+
+
+class JsonEventSerializer(EventSerializer):
+    def dumps(self, payload: EventPayload) -> str | bytes:
+        return payload.model_dump_json()
+
+    def loads(self, raw: str | bytes) -> Any:
+        return json.loads(raw)
+
+
+class OrjsonEventSerializer(JsonEventSerializer):
+    """
+    Decodes with orjson. Encoding stays on pydantic's ``model_dump_json``,
+    which is faster than running orjson over ``model_dump()``.
+    """
+
+    def __init__(self) -> None:
+        if not _has_orjson:
+            raise RuntimeError("orjson is not installed")
+
+    def loads(self, raw: str | bytes) -> Any:
+        return orjson.loads(raw)
+
+
+def default_serializer() -> EventSerializer:
+    return OrjsonEventSerializer() if _has_orjson else JsonEventSerializer()
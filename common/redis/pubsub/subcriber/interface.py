@@ -1,8 +1,9 @@
 import asyncio
-import json
 import logging
-from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Set, Type, Optional
+import heapq
+import time
+from datetime import timedelta
+from typing import Dict, List, Set, Tuple, Type, Optional
 
 from redis.asyncio import Redis
 from redis.asyncio.client import PubSub
@@ -12,14 +13,37 @@ from common.redis.pubsub import (
     BaseEventType,
     ConnectionLike,
     EventPayload,
+    OverflowPolicy,
+    EventSerializer,
+    default_serializer,
+    SessionRegistry,
 )
 
 
 class EventSubscriber(_EventRegistry):
 
-    PING_INTERVAL = timedelta(minutes=30)
+    # None disables the heartbeat.
+    PING_INTERVAL: Optional[timedelta] = timedelta(minutes=30)
     PING_TIMEOUT = 10
+    PING_CONCURRENCY = 100
+    PING_MESSAGE = '{"type":"ping"}'
+    # By default the heartbeat never reads from the socket: the application
+    # owns the receive loop and calls touch() when a pong (or any frame)
+    # arrives, and a connection without activity within PING_TIMEOUT of a ping
+    # is closed. Outbound traffic never counts as activity. Until the
+    # application has called touch() at least once, a ping only checks that
+    # the socket still accepts writes. AWAIT_PONG = True
+    # restores the old behaviour of awaiting the pong with receive_text(); it
+    # competes with the application's own receive_text() (Starlette raises or
+    # loses frames), so only use it when nothing else reads the socket.
+    AWAIT_PONG = False
     CONNECTIONS_LIMIT = 50
+    # 0 makes the send queues unbounded, so OVERFLOW_POLICY never applies.
+    SEND_QUEUE_SIZE = 256
+    OVERFLOW_POLICY = OverflowPolicy.drop_oldest
+
+    # Cheap substring check that rejects foreign traffic before json.loads.
+    _DESTINATION_MARKER = '"ws_event"'
 
     def __init__(
         self,
@@ -28,23 +52,83 @@ class EventSubscriber(_EventRegistry):
         logger: logging.Logger,
         events_cls: Optional[Type[BaseEventType]] = None,
         events_payload_cls: Optional[Type[EventPayload]] = None,
+        targeted_subscriptions: bool = False,
+        lazy_validation: bool = False,
+        serializer: Optional[EventSerializer] = None,
+        registry: Optional[SessionRegistry] = None,
     ) -> None:
+        """
+        By default the subscriber does ``psubscribe("*")`` and receives every
+        message published on the Redis instance. With
+        ``targeted_subscriptions=True`` it instead SUBSCRIBEs only to the
+        channels held by its local connections, adding a channel when its first
+        connection subscribes and dropping it when the last one leaves.
+
+        ``lazy_validation=True`` skips the full ``events_payload_cls``
+        validation for messages whose ``event`` is a member of ``events_cls``
+        and whose ``data`` is an object, since the raw text is forwarded
+        verbatim anyway.
+
+        Every connection gets its own bounded outbound queue drained by a
+        writer task, so the Redis listener never waits on a slow websocket.
+        When a queue is full ``OVERFLOW_POLICY`` decides whether the oldest or
+        the newest message is dropped, or the connection is closed.
+
+        With a ``registry`` the node records its sessions in Redis, enforces
+        ``CONNECTIONS_LIMIT`` across all nodes, and delivers messages published
+        through ``EventPublisher.publish_to_session`` to every local connection
+        of the target session.
+        """
         super().__init__(events_cls=events_cls, events_payload_cls=events_payload_cls)
         self._redis: Redis = redis
         self._pubsub: PubSub | None = None
+        self._targeted = targeted_subscriptions
+        self._subscribed_channels: Set[str] = set()
+        self._subscriptions_lock = asyncio.Lock()
+        self._has_subscriptions = asyncio.Event()
+        self._lazy_validation = lazy_validation
+        self._serializer = serializer or default_serializer()
+        self._registry = registry
+        self._refresher: asyncio.Task[None] | None = None
+        self._validated_count = 0
+        self._fast_path_count = 0
+        self._skipped_count = 0
         self._listener: asyncio.Task[None] | None = None
+        self._pinger: asyncio.Task[None] | None = None
         self._stop = asyncio.Event()
         self._logger = logger
 
         self._sessions: Dict[str, Set[ConnectionLike]] = {}
-        self._session_channels: Dict[str, Set[str]] = {}
-        self._last_active: Dict[ConnectionLike, datetime] = {}
+        self._session_channels: Dict[ConnectionLike, Set[str]] = {}
+        self._channel_connections: Dict[str, Set[ConnectionLike]] = {}
+        self._last_active: Dict[ConnectionLike, float] = {}
+        self._last_seen: Dict[ConnectionLike, float] = {}
+
+        self._connection_sessions: Dict[ConnectionLike, str] = {}
+        self._send_queues: Dict[ConnectionLike, asyncio.Queue[str]] = {}
+        self._writers: Dict[ConnectionLike, asyncio.Task[None]] = {}
+        self._background_tasks: Set[asyncio.Task[None]] = set()
+        self._dropped_count = 0
+        self._slow_disconnects = 0
+        self._ping_heap: List[Tuple[float, int, ConnectionLike]] = []
+        self._ping_seq = 0
+        self._ping_wakeup = asyncio.Event()
+        self._touch_seen = False
 
     async def start(self) -> None:
         self._pubsub = self._redis.pubsub()
-        await self._pubsub.psubscribe("*")
+        if self._targeted:
+            await self._sync_subscriptions()
+        else:
+            await self._pubsub.psubscribe("*")
+        if self._registry is not None:
+            if self._targeted:
+                await self._pubsub.psubscribe(self._registry.node_pattern)
+                self._has_subscriptions.set()
+            self._refresher = asyncio.create_task(self._refresh_loop())
         self._listener = asyncio.create_task(self._listen())
-        self._pinger = asyncio.create_task(self._ping_loop())
+        if self.PING_INTERVAL is not None:
+            self._pinger = asyncio.create_task(self._ping_loop())
 
     async def stop(self) -> None:
         self._stop.set()
@@ -52,6 +136,8 @@ class EventSubscriber(_EventRegistry):
             self._listener.cancel()
         if self._pinger and not self._pinger.done():
             self._pinger.cancel()
+        if self._refresher and not self._refresher.done():
+            self._refresher.cancel()
         if self._pubsub:
             await self._pubsub.close()
 
@@ -64,9 +150,29 @@ class EventSubscriber(_EventRegistry):
         if coros:
             await asyncio.gather(*coros, return_exceptions=True)
 
+        for writer in self._writers.values():
+            writer.cancel()
+        for task in self._background_tasks:
+            task.cancel()
+
+        if self._registry is not None:
+            try:
+                await self._registry.clear(list(self._sessions))
+            except Exception as e:
+                self._logger.warning(f"Failed to clear session registry: {e}")
+
         self._sessions.clear()
         self._session_channels.clear()
+        self._channel_connections.clear()
+        self._subscribed_channels.clear()
+        self._has_subscriptions.clear()
         self._last_active.clear()
+        self._last_seen.clear()
+        self._ping_heap.clear()
+        self._connection_sessions.clear()
+        self._send_queues.clear()
+        self._writers.clear()
+        self._background_tasks.clear()
 
     async def subscribe_user(
         self,
@@ -81,20 +187,39 @@ class EventSubscriber(_EventRegistry):
 
         ws_set = self._sessions.setdefault(session_id, set())
 
-        if ws not in ws_set and len(ws_set) >= self.CONNECTIONS_LIMIT:
-            await self._safe_close(
-                ws, 1008, f"Connection limit ({self.CONNECTIONS_LIMIT}) exceeded"
-            )
-            return
-
         if ws in ws_set:
             self._session_channels[ws].update(channels)
-            self._last_active[ws] = datetime.now(timezone.utc)
+            self._index_channels(ws, channels)
+            self._last_active[ws] = time.monotonic()
+            await self._sync_subscriptions()
             return
 
+        # Reserve the slot before awaiting the count, so concurrent subscribes
+        # of one session cannot all pass the limit.
         ws_set.add(ws)
+        if await self._session_connections(session_id) > self.CONNECTIONS_LIMIT:
+            ws_set.discard(ws)
+            if not ws_set and self._sessions.get(session_id) is ws_set:
+                self._sessions.pop(session_id, None)
+            await self._safe_close(
+                ws, 1008, f"Connection limit ({self.CONNECTIONS_LIMIT}) exceeded"
+            )
+            return
+
+        self._connection_sessions[ws] = session_id
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self.SEND_QUEUE_SIZE)
+        self._send_queues[ws] = queue
+        self._writers[ws] = asyncio.create_task(self._writer(ws, queue))
         self._session_channels[ws] = set(channels)
-        self._last_active[ws] = datetime.now(timezone.utc)
+        self._index_channels(ws, channels)
+        self._last_active[ws] = time.monotonic()
+        if self.PING_INTERVAL is not None:
+            self._schedule_ping(
+                ws, self._last_active[ws] + self.PING_INTERVAL.total_seconds()
+            )
+        if self._registry is not None:
+            await self._registry_update(session_id, 1)
+        await self._sync_subscriptions()
 
     async def unsubscribe_user(
         self,
@@ -115,6 +240,7 @@ class EventSubscriber(_EventRegistry):
             else:
                 current = self._session_channels.get(conn, set())
                 current.difference_update(channels)
+                self._unindex_channels(conn, channels)
                 if not current and close_if_empty:
                     await self._safe_close(conn, 1000, "No channels remaining")
                     self._remove_connection(session_id, conn)
@@ -124,10 +250,53 @@ class EventSubscriber(_EventRegistry):
         if not self._sessions.get(session_id):
             self._sessions.pop(session_id, None)
 
-    async def _listen(self) -> None:
+        await self._sync_subscriptions()
+
+    async def _sync_subscriptions(self) -> None:
+        """Reconcile Redis channel subscriptions with the local channel index."""
+        if not self._targeted or self._pubsub is None:
+            return
+
+        async with self._subscriptions_lock:
+            wanted = set(self._channel_connections)
+            to_subscribe = wanted - self._subscribed_channels
+            to_unsubscribe = self._subscribed_channels - wanted
+
+            try:
+                if to_subscribe:
+                    await self._pubsub.subscribe(*to_subscribe)
+                    self._subscribed_channels.update(to_subscribe)
+                if to_unsubscribe:
+                    await self._pubsub.unsubscribe(*to_unsubscribe)
+                    self._subscribed_channels.difference_update(to_unsubscribe)
+            except Exception as e:
+                self._logger.warning(f"Failed to sync redis subscriptions: {e}")
+
+            if self._subscribed_channels or self._registry is not None:
+                self._has_subscriptions.set()
+            else:
+                self._has_subscriptions.clear()
+
+    async def _messages(self):
         assert self._pubsub is not None
-        async for msg in self._pubsub.listen():
-            if msg.get("type") != "pmessage":
+        if not self._targeted:
+            async for msg in self._pubsub.listen():
+                yield msg
+            return
+
+        while not self._stop.is_set():
+            if not self._has_subscriptions.is_set():
+                await self._has_subscriptions.wait()
+                continue
+            msg = await self._pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=1.0
+            )
+            if msg is not None:
+                yield msg
+
+    async def _listen(self) -> None:
+        async for msg in self._messages():
+            if msg.get("type") not in ("message", "pmessage"):
                 continue
 
             channel: str = (
@@ -136,70 +305,275 @@ class EventSubscriber(_EventRegistry):
                 else msg["channel"]
             )
 
-            raw_txt = msg.get("data")
-            try:
-                raw = json.loads(
-                    raw_txt.decode()
-                    if isinstance(raw_txt, (bytes, bytearray))
-                    else raw_txt
-                )
-
-                if not isinstance(raw, dict) or raw.get("destination") != "ws_event":
-                    continue
-
-                payload = self._events_payload_cls.model_validate(raw)
-            except Exception as e:
-                self._logger.warning("raw_data: %s; conv_err: %s", raw, e)
-                continue
-
-            if not self._is_registered(payload.event):
-                self._logger.error("event isn't registered, raw data: %s", raw)
+            raw_txt = self._filter_message(msg.get("data"))
+            if raw_txt is None:
                 continue
 
-            await self._fanout(channel, raw_txt)
+            if self._registry is not None and channel.startswith(
+                self._registry.node_channel_prefix
+            ):
+                session_id = channel[len(self._registry.node_channel_prefix):]
+                self._deliver(self._sessions.get(session_id), raw_txt)
+            else:
+                await self._fanout(channel, raw_txt)
             if self._stop.is_set():
                 break
 
+    def _filter_message(self, data) -> Optional[str]:
+        """
+        Parse a pub/sub message once and return the text to forward, or None if
+        it should be dropped. With lazy validation, messages whose event is a
+        known member of ``events_cls`` are forwarded without building the
+        payload model.
+        """
+        raw_txt = data.decode() if isinstance(data, (bytes, bytearray)) else data
+        if not isinstance(raw_txt, str) or self._DESTINATION_MARKER not in raw_txt:
+            self._skipped_count += 1
+            return None
+
+        raw = None
+        try:
+            raw = self._serializer.loads(raw_txt)
+
+            if not isinstance(raw, dict) or raw.get("destination") != "ws_event":
+                self._skipped_count += 1
+                return None
+
+            if (
+                self._lazy_validation
+                and self._event_values is not None
+                and raw.get("event") in self._event_values
+                and isinstance(raw.get("data"), dict)
+            ):
+                self._fast_path_count += 1
+                return raw_txt
+
+            payload = self._events_payload_cls.model_validate(raw)
+            self._validated_count += 1
+        except Exception as e:
+            self._logger.warning("raw_data: %s; conv_err: %s", raw, e)
+            return None
+
+        if not self._is_registered(payload.event):
+            self._logger.error("event isn't registered, raw data: %s", raw)
+            return None
+
+        return raw_txt
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "messages_validated": self._validated_count,
+            "messages_fast_path": self._fast_path_count,
+            "messages_skipped": self._skipped_count,
+            "messages_dropped": self._dropped_count,
+            "slow_consumers_disconnected": self._slow_disconnects,
+            "send_queue_depth": sum(q.qsize() for q in self._send_queues.values()),
+        }
+
+    def queue_depth(self, ws: ConnectionLike) -> int:
+        queue = self._send_queues.get(ws)
+        return queue.qsize() if queue is not None else 0
+
     async def _fanout(self, channel: str, raw: str) -> None:
-        now = datetime.now(timezone.utc)
-        coros = []
-        for conn, ch_set in self._session_channels.items():
-            if channel in ch_set:
-                coros.append(conn.send_text(raw))
-                self._last_active[conn] = now
-        if coros:
-            await asyncio.gather(*coros, return_exceptions=True)
+        self._deliver(self._channel_connections.get(channel), raw)
+
+    def _deliver(self, conns: Optional[Set[ConnectionLike]], raw: str) -> None:
+        if not conns:
+            return
+
+        now = time.monotonic()
+        slow: List[ConnectionLike] = []
+        for conn in conns:
+            if not self._enqueue(conn, raw):
+                slow.append(conn)
+                continue
+            self._last_active[conn] = now
+
+        for conn in slow:
+            self._drop_slow_consumer(conn)
+
+    def _enqueue(self, ws: ConnectionLike, raw: str) -> bool:
+        """Queue ``raw`` for ``ws``; returns False if ``ws`` must be disconnected."""
+        queue = self._send_queues.get(ws)
+        if queue is None:
+            return True
+
+        if queue.full():
+            self._dropped_count += 1
+            if self.OVERFLOW_POLICY == OverflowPolicy.drop_newest:
+                return True
+            if self.OVERFLOW_POLICY == OverflowPolicy.disconnect:
+                return False
+            queue.get_nowait()
+
+        queue.put_nowait(raw)
+        return True
+
+    async def _writer(self, ws: ConnectionLike, queue: asyncio.Queue[str]) -> None:
+        while True:
+            raw = await queue.get()
+            try:
+                await ws.send_text(raw)
+            except Exception as e:
+                session_id = self._connection_sessions.get(ws)
+                if session_id is None:
+                    return
+                self._logger.info(f"Send failed ({e}) - closing")
+                # Detach first so _remove_connection does not cancel this task.
+                self._writers.pop(ws, None)
+                self._remove_connection(session_id, ws)
+                self._spawn(self._close_removed(ws, 1011, "Send failed"))
+                return
+
+    def _drop_slow_consumer(self, ws: ConnectionLike) -> None:
+        session_id = self._connection_sessions.get(ws)
+        if session_id is None:
+            return
+
+        self._slow_disconnects += 1
+        self._remove_connection(session_id, ws)
+        self._spawn(self._close_removed(ws, 1013, "Slow consumer"))
+
+    def _spawn(self, coro) -> asyncio.Task[None]:
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def _close_removed(self, ws: ConnectionLike, code: int, reason: str) -> None:
+        await self._safe_close(ws, code, reason)
+        await self._sync_subscriptions()
 
     async def _ping_loop(self) -> None:
+        """
+        Heap-driven heartbeat: sleeps until the earliest connection becomes
+        idle, then pings every due connection concurrently (at most
+        ``PING_CONCURRENCY`` in flight). A connection has no heap entry while
+        its ping is in flight; the next one is pushed when the ping completes.
+        """
+        interval = self.PING_INTERVAL.total_seconds()
+        semaphore = asyncio.Semaphore(self.PING_CONCURRENCY)
+
         while not self._stop.is_set():
-            await asyncio.sleep(self.PING_INTERVAL.total_seconds())
-            now = datetime.now(timezone.utc)
-            for session_id, conns in list(self._sessions.items()):
-                for conn in list(conns):
-                    last = self._last_active.get(conn, now)
-                    if now - last < self.PING_INTERVAL:
-                        continue
-
-                    try:
-                        await conn.send_text('{"type":"ping"}')
-                        pong_task = asyncio.create_task(
-                            conn.receive_text()
-                        )  # TODO - think about this
-                        done, _ = await asyncio.wait(
-                            {pong_task},
-                            timeout=self.PING_TIMEOUT,
-                            return_when=asyncio.FIRST_COMPLETED,
-                        )
-
-                        if pong_task not in done or not pong_task.result():
-                            raise TimeoutError("pong not received")
-
-                        self._last_active[conn] = datetime.now(timezone.utc)
-
-                    except Exception as e:
-                        self._logger.info(f"Ping failed ({e}) - closing")
-                        await self._safe_close(conn, 1001, "Ping timeout")
-                        self._remove_connection(session_id, conn)
+            now = time.monotonic()
+            delay = self._ping_heap[0][0] - now if self._ping_heap else interval
+            if delay > 0:
+                self._ping_wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._ping_wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            while self._ping_heap and self._ping_heap[0][0] <= now:
+                _, _, conn = heapq.heappop(self._ping_heap)
+                if conn not in self._connection_sessions:
+                    continue
+
+                due = self._last_active.get(conn, now) + interval
+                if due > now:
+                    self._schedule_ping(conn, due)
+                    continue
+
+                task = self._spawn(self._ping(conn, semaphore))
+                task.add_done_callback(self._ping_done)
+
+    def _ping_done(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if result is not None:
+            conn, sent_at = result
+            self._schedule_ping(conn, sent_at + self.PING_INTERVAL.total_seconds())
+
+    def _schedule_ping(self, ws: ConnectionLike, at: float) -> None:
+        if not self._ping_heap or at < self._ping_heap[0][0]:
+            self._ping_wakeup.set()
+        self._ping_seq += 1
+        heapq.heappush(self._ping_heap, (at, self._ping_seq, ws))
+
+    async def _ping(
+        self, conn: ConnectionLike, semaphore: asyncio.Semaphore
+    ) -> Optional[Tuple[ConnectionLike, float]]:
+        """Ping ``conn``; returns it with the send time if it is still alive."""
+        async with semaphore:
+            sent_at = time.monotonic()
+            try:
+                if not self._enqueue(conn, self.PING_MESSAGE):
+                    raise TimeoutError("send queue overflow")
+
+                if self.AWAIT_PONG:
+                    pong_task = asyncio.create_task(conn.receive_text())
+                    done, _ = await asyncio.wait({pong_task}, timeout=self.PING_TIMEOUT)
+                    if pong_task not in done:
+                        pong_task.cancel()
+                        raise TimeoutError("pong not received")
+                    if not pong_task.result():
+                        raise TimeoutError("empty pong")
+                    self.touch(conn)
+                else:
+                    await asyncio.sleep(self.PING_TIMEOUT)
+                    if (
+                        self._touch_seen
+                        and self._last_seen.get(conn, sent_at) <= sent_at
+                    ):
+                        raise TimeoutError("no activity after ping")
+
+            except Exception as e:
+                session_id = self._connection_sessions.get(conn)
+                if session_id is None:
+                    return None
+                self._logger.info(f"Ping failed ({e}) - closing")
+                await self._safe_close(conn, 1001, "Ping timeout")
+                self._remove_connection(session_id, conn)
+                await self._sync_subscriptions()
+                return None
+
+        if conn not in self._connection_sessions:
+            return None
+        return conn, sent_at
+
+    async def _session_connections(self, session_id: str) -> int:
+        """
+        Connections of ``session_id``, counting the one subscribe_user has just
+        reserved locally but not yet added to the registry.
+        """
+        local = len(self._sessions.get(session_id, ()))
+        if self._registry is None:
+            return local
+        try:
+            return max(local, await self._registry.count(session_id) + 1)
+        except Exception as e:
+            self._logger.warning(f"Session registry lookup failed: {e}")
+            return local
+
+    async def _registry_update(self, session_id: str, delta: int) -> None:
+        try:
+            if delta > 0:
+                await self._registry.add(session_id)
+            else:
+                await self._registry.remove(session_id)
+        except Exception as e:
+            self._logger.warning(f"Session registry update failed: {e}")
+
+    async def _refresh_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self._registry.refresh(
+                    {sid: len(conns) for sid, conns in self._sessions.items()}
+                )
+            except Exception as e:
+                self._logger.warning(f"Session registry refresh failed: {e}")
+            await asyncio.sleep(self._registry.ttl / 3)
+
+    def touch(self, ws: ConnectionLike) -> None:
+        """Mark ``ws`` as alive, e.g. when the application receives a pong from it."""
+        self._touch_seen = True
+        if ws in self._connection_sessions:
+            now = time.monotonic()
+            self._last_active[ws] = now
+            self._last_seen[ws] = now
 
     async def _safe_close(self, ws: ConnectionLike, code: int, reason: str) -> None:
         try:
@@ -207,9 +581,31 @@ class EventSubscriber(_EventRegistry):
         except Exception as e:
             self._logger.info(f"Error closing websocket: {e}")
 
+    def _index_channels(self, ws: ConnectionLike, channels) -> None:
+        for channel in channels:
+            self._channel_connections.setdefault(channel, set()).add(ws)
+
+    def _unindex_channels(self, ws: ConnectionLike, channels) -> None:
+        for channel in channels:
+            conns = self._channel_connections.get(channel)
+            if conns is None:
+                continue
+            conns.discard(ws)
+            if not conns:
+                self._channel_connections.pop(channel, None)
+
     def _remove_connection(self, session_id: str, ws: ConnectionLike) -> None:
-        self._sessions.get(session_id, set()).discard(ws)
-        self._session_channels.pop(ws, None)
+        ws_set = self._sessions.get(session_id, set())
+        if ws in ws_set and self._registry is not None:
+            self._spawn(self._registry_update(session_id, -1))
+        ws_set.discard(ws)
+        self._unindex_channels(ws, self._session_channels.pop(ws, ()))
         self._last_active.pop(ws, None)
+        self._last_seen.pop(ws, None)
+        self._connection_sessions.pop(ws, None)
+        self._send_queues.pop(ws, None)
+        writer = self._writers.pop(ws, None)
+        if writer is not None:
+            writer.cancel()
         if not self._sessions.get(session_id):
             self._sessions.pop(session_id, None)
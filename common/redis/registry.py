@@ -0,0 +1,94 @@
+import logging
+from typing import Dict, List
+
+import redis as sync_redis
+from redis import asyncio as redis
+
+from common.redis.core import create_redis_pool, get_redis_pool_stats, warm_redis_pool
+
+
+class RedisPoolRegistry:
+    """
+    Process-wide set of named Redis clients ("default", "cache", "pubsub",
+    "octopus", ...), created once at startup and shared by every helper, so a
+    worker holds a fixed, known number of Redis connections.
+
+    Async clients come from ``create_redis_pool``; ``create_sync`` registers a
+    blocking ``redis.Redis`` for code that is still synchronous.
+    """
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self._logger = logger
+        self._pools: Dict[str, redis.Redis] = {}
+        self._sync_pools: Dict[str, sync_redis.Redis] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._pools or name in self._sync_pools
+
+    @property
+    def names(self) -> List[str]:
+        return [*self._pools, *self._sync_pools]
+
+    def create(self, name: str, connection_url, **pool_kwargs) -> redis.Redis:
+        if name in self:
+            raise RuntimeError(f"Redis pool '{name}' already exists")
+        client = create_redis_pool(connection_url, self._logger, **pool_kwargs)
+        self._pools[name] = client
+        return client
+
+    def create_sync(
+        self, name: str, connection_url, **pool_kwargs
+    ) -> sync_redis.Redis:
+        if name in self:
+            raise RuntimeError(f"Redis pool '{name}' already exists")
+        client = sync_redis.Redis(
+            connection_pool=sync_redis.ConnectionPool.from_url(
+                connection_url, **pool_kwargs
+            )
+        )
+        self._sync_pools[name] = client
+        return client
+
+    def register(self, name: str, client: redis.Redis) -> None:
+        if name in self:
+            raise RuntimeError(f"Redis pool '{name}' already exists")
+        self._pools[name] = client
+
+    def get(self, name: str) -> redis.Redis:
+        client = self._pools.get(name)
+        if client is None:
+            raise RuntimeError(f"Redis pool '{name}' does not found in registry")
+        return client
+
+    def get_sync(self, name: str) -> sync_redis.Redis:
+        client = self._sync_pools.get(name)
+        if client is None:
+            raise RuntimeError(f"Sync redis pool '{name}' does not found in registry")
+        return client
+
+    async def warm(self, connections: int) -> Dict[str, int]:
+        return {
+            name: await warm_redis_pool(client, connections)
+            for name, client in self._pools.items()
+        }
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: get_redis_pool_stats(client) for name, client in self._pools.items()
+        }
+
+    async def close(self) -> None:
+        for name, client in self._pools.items():
+            try:
+                await client.aclose()
+                await client.connection_pool.disconnect()
+            except Exception as e:
+                self._logger.warning(f"Error closing redis pool '{name}': {e}")
+        for name, client in self._sync_pools.items():
+            try:
+                client.close()
+                client.connection_pool.disconnect()
+            except Exception as e:
+                self._logger.warning(f"Error closing redis pool '{name}': {e}")
+        self._pools.clear()
+        self._sync_pools.clear()